@@ -9,6 +9,8 @@ Data:  Place roosevelt_island_headways.csv alongside this file (or in data/).
 """
 
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -16,8 +18,8 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 from data_loader import (
-    load_headways, get_median, get_pct_over,
-    SWAP_DATE, SWAP_ACTIVE_BUCKETS, TIME_BUCKETS
+    load_headways, build_summary, get_median, get_pct_over,
+    SWAP_ACTIVE_BUCKETS, TIME_BUCKETS
 )
 from analytics import init_analytics, track_scroll_depth
 
@@ -302,6 +304,13 @@ st.markdown(f"""
     line-height: 1.5;
   }}
 
+  /* ── Before/after extreme-wait cards ── */
+  .ew-grid {{
+    display: grid;
+    grid-template-columns: 5fr 1fr 5fr;
+    gap: 1rem;
+  }}
+
   /* ── CTA buttons ── */
   .cta-btn {{
     display: block;
@@ -335,6 +344,10 @@ st.markdown(f"""
     /* Stack Streamlit columns */
     [data-testid="column"] {{ width: 100% !important; flex: 100% !important; }}
 
+    /* Before/after cards: stack, drop the spacer column */
+    .ew-grid {{ grid-template-columns: 1fr; }}
+    .ew-spacer {{ display: none; }}
+
     /* CTA buttons: stack vertically, full-width, generous touch target */
     .cta-row {{ flex-direction: column !important; }}
     .cta-row > * {{ min-height: 64px; width: 100% !important; box-sizing: border-box; }}
@@ -350,25 +363,45 @@ st.markdown(f"""
 
 
 # ── Data loading ──────────────────────────────────────────────────────────────
-@st.cache_data(ttl=3600, show_spinner="Loading transit data...")
-def get_data() -> pd.DataFrame:
-    return load_headways(source="csv")
+# cache_resource hands every rerun the same prepared frame instead of
+# unpickling a fresh copy the way cache_data does — treat it as read-only.
+# The frame is too large to hash on every rerun, so the caches derived from
+# it take it unhashed (_df) and are keyed on data_version, a token stamped
+# on each load: a reload gets a new token and so misses their old entries.
+@st.cache_resource(ttl=3600, show_spinner="Loading transit data...")
+def get_data() -> tuple[pd.DataFrame, int]:
+    return load_headways(source="csv"), time.time_ns()
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def hourly_stats(_df: pd.DataFrame, data_version: int) -> pd.DataFrame:
+    """Weekday median and 90th-percentile headway, indexed by
+    (direction, time_bucket, swap_period). One groupby pass shared by both
+    direction charts instead of re-filtering the frame per bucket."""
+    g = _df[_df["is_weekday"]].groupby(["direction", "time_bucket", "swap_period"], observed=True)["headway_min"]
+    return pd.DataFrame({"median": g.median(), "p90": g.quantile(0.90)})
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_summary(_df: pd.DataFrame, data_version: int) -> dict:
+    return build_summary(_df)
 
 
-df = get_data()
+df, data_version = get_data()
+summary = get_summary(df, data_version)
 n_obs      = len(df)
-date_min   = df["arrival_date"].min()
-date_max   = df["arrival_date"].max()
+date_min   = df["arrival_date"].min().date()
+date_max   = df["arrival_date"].max().date()
 n_weekdays = df[df["is_weekday"]]["arrival_date"].nunique()
 
 
 # ── Computed metrics (used throughout layout) ─────────────────────────────────
-ev_nb_b = get_median(df, day_type="Weekday", bucket="Evening Rush (4–7 PM)", direction="N", period="Before swap")
-ev_nb_a = get_median(df, day_type="Weekday", bucket="Evening Rush (4–7 PM)", direction="N", period="After swap")
-am_sb_b = get_median(df, day_type="Weekday", bucket="Morning Rush (6–9 AM)", direction="S", period="Before swap")
-am_sb_a = get_median(df, day_type="Weekday", bucket="Morning Rush (6–9 AM)", direction="S", period="After swap")
-pct_over_10_before = get_pct_over(df, 10.0, direction="N", period="Before swap")
-pct_over_10_after  = get_pct_over(df, 10.0, direction="N", period="After swap")
+ev_nb_b = get_median(summary, day_type="Weekday", bucket="Evening Rush (4–7 PM)", direction="N", period="Before swap")
+ev_nb_a = get_median(summary, day_type="Weekday", bucket="Evening Rush (4–7 PM)", direction="N", period="After swap")
+am_sb_b = get_median(summary, day_type="Weekday", bucket="Morning Rush (6–9 AM)", direction="S", period="Before swap")
+am_sb_a = get_median(summary, day_type="Weekday", bucket="Morning Rush (6–9 AM)", direction="S", period="After swap")
+pct_over_10_before = get_pct_over(summary, 10.0, direction="N", period="Before swap")
+pct_over_10_after  = get_pct_over(summary, 10.0, direction="N", period="After swap")
 
 ev_pct        = (ev_nb_a - ev_nb_b) / ev_nb_b * 100
 am_pct        = (am_sb_a - am_sb_b) / am_sb_b * 100
@@ -377,10 +410,14 @@ am_delta      = am_sb_a - am_sb_b
 monthly_extra = am_delta * 2 * 22
 
 # Extreme wait statistics — both directions, swap-active hours, weekdays
-_ew_bef = df[df["within_swap_window"] & (df["day_type"] == "Weekday") & (df["swap_period"] == "Before swap")]["headway_min"]
-_ew_aft = df[df["within_swap_window"] & (df["day_type"] == "Weekday") & (df["swap_period"] == "After swap")]["headway_min"]
-_bef_days = df[df["is_weekday"] & (df["arrival_date"] < SWAP_DATE)]["arrival_date"].nunique()
-_aft_days = df[df["is_weekday"] & (df["arrival_date"] >= SWAP_DATE)]["arrival_date"].nunique()
+# (within_swap_window already implies a weekday; masks are combined on the raw arrays)
+_h       = df["headway_min"].to_numpy()
+_window  = df["within_swap_window"].to_numpy()
+_preswap = df["is_preswap"].to_numpy()
+_ew_bef  = _h[_window & _preswap]
+_ew_aft  = _h[_window & ~_preswap]
+_bef_days = df[df["is_weekday"] & df["is_preswap"]]["arrival_date"].nunique()
+_aft_days = df[df["is_weekday"] & ~df["is_preswap"]]["arrival_date"].nunique()
 ew_bef = {t: (100*(_ew_bef > t).mean(), (_ew_bef > t).sum()/_bef_days) for t in [15, 20, 25]}
 ew_aft = {t: (100*(_ew_aft > t).mean(), (_ew_aft > t).sum()/_aft_days) for t in [15, 20, 25]}
 
@@ -478,6 +515,9 @@ PLOTLY_LAYOUT = dict(
     margin=dict(l=70, r=20, t=100, b=80),
 )
 
+# Shared by every st.plotly_chart call
+PLOTLY_CONFIG = {"displayModeBar": False}
+
 LEGEND_BASE = dict(
     bgcolor="rgba(0,0,0,0)",
     bordercolor=LIGHT_NAVY,
@@ -497,19 +537,19 @@ def add_swap_bands(fig, x_vals, swap_active_flags, row=None, col=None):
                 **kwargs
             )
 
-def direction_overview_fig(df: pd.DataFrame, direction: str, dir_label: str) -> go.Figure:
-    wd = df[(df["day_type"] == "Weekday") & (df["direction"] == direction)]
+def direction_overview_fig(stats: pd.DataFrame, direction: str, dir_label: str) -> go.Figure:
+    sub = stats.xs(direction, level="direction")
     tick_labels, bef_med, aft_med, bef_p90, aft_p90, active = [], [], [], [], [], []
     for _, __, label in TIME_BUCKETS:
         if "Early AM" in label:
             continue  # Swap inactive overnight; long headways distort the y-axis
-        sub = wd[wd["time_bucket"] == label]
-        b = sub[sub["swap_period"] == "Before swap"]["headway_min"]
-        a = sub[sub["swap_period"] == "After swap"]["headway_min"]
-        if b.empty or a.empty: continue
+        if (label, "Before swap") not in sub.index or (label, "After swap") not in sub.index:
+            continue
+        b = sub.loc[(label, "Before swap")]
+        a = sub.loc[(label, "After swap")]
         tick_labels.append(label.split(" (")[0])  # "Morning Rush", "Midday", etc.
-        bef_med.append(b.median()); aft_med.append(a.median())
-        bef_p90.append(b.quantile(0.90)); aft_p90.append(a.quantile(0.90))
+        bef_med.append(b["median"]); aft_med.append(a["median"])
+        bef_p90.append(b["p90"]); aft_p90.append(a["p90"])
         active.append(label in SWAP_ACTIVE_BUCKETS)
 
     n = len(tick_labels)
@@ -573,9 +613,10 @@ def direction_overview_fig(df: pd.DataFrame, direction: str, dir_label: str) ->
 
 
 def long_wait_fig(df: pd.DataFrame, direction: str, dir_label: str) -> go.Figure:
-    sub = df[df["within_swap_window"] & (df["day_type"] == "Weekday") & (df["direction"] == direction)]
-    b = sub[sub["swap_period"] == "Before swap"]["headway_min"]
-    a = sub[sub["swap_period"] == "After swap"]["headway_min"]
+    h   = df["headway_min"].to_numpy()
+    sel = df["within_swap_window"].to_numpy() & (df["direction"] == direction).to_numpy()
+    pre = df["is_preswap"].to_numpy()
+    b, a = h[sel & pre], h[sel & ~pre]
     thresholds = [5, 8, 10, 12, 15]
     bef_pcts = [100 * (b > t).mean() for t in thresholds]
     aft_pcts = [100 * (a > t).mean() for t in thresholds]
@@ -609,14 +650,16 @@ def long_wait_fig(df: pd.DataFrame, direction: str, dir_label: str) -> go.Figure
 
 
 def evening_spotlight_fig(df: pd.DataFrame) -> go.Figure:
-    wd = df[(df["day_type"] == "Weekday") & (df["time_bucket"] == "Evening Rush (4–7 PM)")]
+    h   = df["headway_min"].to_numpy()
+    eve = df["is_weekday"].to_numpy() & (df["time_bucket"] == "Evening Rush (4–7 PM)").to_numpy()
+    pre = df["is_preswap"].to_numpy()
     dirs = [("N", "Northbound<br>(→ Queens/Home)"), ("S", "Southbound<br>(→ Manhattan)")]
     bef, aft, bef_p, aft_p = [], [], [], []
     for code, _ in dirs:
-        b = wd[(wd["direction"] == code) & (wd["swap_period"] == "Before swap")]["headway_min"]
-        a = wd[(wd["direction"] == code) & (wd["swap_period"] == "After swap")]["headway_min"]
-        bef.append(b.median()); aft.append(a.median())
-        bef_p.append(b.quantile(0.90)); aft_p.append(a.quantile(0.90))
+        sel = eve & (df["direction"] == code).to_numpy()
+        b, a = h[sel & pre], h[sel & ~pre]
+        bef.append(np.median(b)); aft.append(np.median(a))
+        bef_p.append(np.quantile(b, 0.90)); aft_p.append(np.quantile(a, 0.90))
     labels = [d[1] for d in dirs]
 
     fig = go.Figure()
@@ -658,7 +701,7 @@ def evening_spotlight_fig(df: pd.DataFrame) -> go.Figure:
 
 
 def weekend_fig(df: pd.DataFrame) -> go.Figure:
-    we = df[df["day_type"] == "Weekend"]
+    we = df[~df["is_weekday"]]
     fig = make_subplots(
         rows=1, cols=2,
         subplot_titles=["Southbound (→ Manhattan)", "Northbound (→ Queens/Home)"],
@@ -714,13 +757,11 @@ def weekend_fig(df: pd.DataFrame) -> go.Figure:
 
 
 def sensitivity_fig(df: pd.DataFrame) -> go.Figure:
-    from datetime import date as date_type
-    storm_date = date_type(2026, 1, 25)
-    wd_swap = df[df["is_weekday"] & (df["arrival_date"] >= SWAP_DATE) & df["within_swap_window"]]
+    window = df["is_weekday"] & df["within_swap_window"]
 
-    pre            = df[df["is_weekday"] & (df["arrival_date"] < SWAP_DATE) & df["within_swap_window"]]
-    post_pre_storm = wd_swap[wd_swap["arrival_date"] < storm_date]
-    post_storm     = wd_swap[wd_swap["arrival_date"] >= storm_date]
+    pre            = df[window & df["is_preswap"]]
+    post_pre_storm = df[window & ~df["is_preswap"] & ~df["is_post_storm"]]
+    post_storm     = df[window & df["is_post_storm"]]
 
     # Color scheme: Blue (F train) → Light red (M pre-storm) → Dark red (M post-storm)
     # Avoids using orange (MTA brand color) for a data point that's neither "before" nor "after"
@@ -764,6 +805,32 @@ def sensitivity_fig(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
+# cache_resource hands back the same go.Figure objects on every rerun;
+# st.plotly_chart only serializes them, so they are never mutated. A cached
+# dict would be re-validated into a Figure by st.plotly_chart each time.
+@st.cache_resource(ttl=3600, show_spinner=False)
+def build_charts(_df: pd.DataFrame, data_version: int) -> dict:
+    """Build every chart once per data load, returned as go.Figure objects.
+    The builders are independent reads of the same frame, so the cold start
+    runs them on a small thread pool; warm reruns skip the pool entirely."""
+    stats = hourly_stats(_df, data_version)
+    jobs = {
+        "evening":     (evening_spotlight_fig, _df),
+        "overview_s":  (direction_overview_fig, stats, "S", "Southbound (→ Manhattan)"),
+        "overview_n":  (direction_overview_fig, stats, "N", "Northbound (→ Queens/Home)"),
+        "long_wait_s": (long_wait_fig, _df, "S", "Southbound (→ Manhattan)"),
+        "long_wait_n": (long_wait_fig, _df, "N", "Northbound (→ Queens/Home)"),
+        "sensitivity": (sensitivity_fig, _df),
+        "weekend":     (weekend_fig, _df),
+    }
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = {name: pool.submit(fn, *args) for name, (fn, *args) in jobs.items()}
+        return {name: fut.result() for name, fut in futures.items()}
+
+
+charts = build_charts(df, data_version)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SECTION 1 — THE IMPACT
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -783,7 +850,7 @@ with stat_col:
     </div>
     """, unsafe_allow_html=True)
 
-st.plotly_chart(evening_spotlight_fig(df), use_container_width=True, config={"displayModeBar": False})
+st.plotly_chart(charts["evening"], use_container_width=True, config=PLOTLY_CONFIG)
 
 st.markdown(f"""
 <div class="callout alarm">
@@ -815,9 +882,9 @@ st.markdown(f"""
 
 col1, col2 = st.columns(2)
 with col1:
-    st.plotly_chart(direction_overview_fig(df, "S", "Southbound (→ Manhattan)"), use_container_width=True, config={"displayModeBar": False})
+    st.plotly_chart(charts["overview_s"], use_container_width=True, config=PLOTLY_CONFIG)
 with col2:
-    st.plotly_chart(direction_overview_fig(df, "N", "Northbound (→ Queens/Home)"), use_container_width=True, config={"displayModeBar": False})
+    st.plotly_chart(charts["overview_n"], use_container_width=True, config=PLOTLY_CONFIG)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -841,77 +908,75 @@ st.markdown(f"""
 </div>
 """, unsafe_allow_html=True)
 
-col_before, col_spacer, col_after = st.columns([5, 1, 5])
-with col_before:
-    st.markdown(f"""
-    <div style='background:rgba(58,155,255,0.12); border:2px solid {BLUE_BEFORE};
-                border-radius:8px; padding:1.5rem;'>
-      <div style='text-align:center; font-size:1rem; font-weight:700; color:{BLUE_BEFORE};
-                  margin-bottom:1.5rem; letter-spacing:0.05em;'>F TRAIN (before Dec 8)</div>
-      <div style='margin:1.2rem 0;'>
-        <div style='font-size:1.9rem; font-weight:800; color:{BLUE_BEFORE};
-                    font-family:"Barlow Condensed",sans-serif;'>
-          15+ minutes: {ew_bef[15][0]:.1f}%
-        </div>
-        <div style='font-size:0.9rem; color:{TEXT_MUTED}; margin-top:0.3rem;'>
-          average {ew_bef[15][1]:.0f} intervals per day
-        </div>
+st.markdown(f"""
+<div class="ew-grid">
+  <div style='background:rgba(58,155,255,0.12); border:2px solid {BLUE_BEFORE};
+              border-radius:8px; padding:1.5rem;'>
+    <div style='text-align:center; font-size:1rem; font-weight:700; color:{BLUE_BEFORE};
+                margin-bottom:1.5rem; letter-spacing:0.05em;'>F TRAIN (before Dec 8)</div>
+    <div style='margin:1.2rem 0;'>
+      <div style='font-size:1.9rem; font-weight:800; color:{BLUE_BEFORE};
+                  font-family:"Barlow Condensed",sans-serif;'>
+        15+ minutes: {ew_bef[15][0]:.1f}%
+      </div>
+      <div style='font-size:0.9rem; color:{TEXT_MUTED}; margin-top:0.3rem;'>
+        average {ew_bef[15][1]:.0f} intervals per day
+      </div>
+    </div>
+    <div style='margin:1.2rem 0;'>
+      <div style='font-size:1.9rem; font-weight:800; color:{BLUE_BEFORE};
+                  font-family:"Barlow Condensed",sans-serif;'>
+        20+ minutes: {ew_bef[20][0]:.1f}%
+      </div>
+      <div style='font-size:0.9rem; color:{TEXT_MUTED}; margin-top:0.3rem;'>
+        average {ew_bef[20][1]:.0f} intervals per day
       </div>
-      <div style='margin:1.2rem 0;'>
-        <div style='font-size:1.9rem; font-weight:800; color:{BLUE_BEFORE};
-                    font-family:"Barlow Condensed",sans-serif;'>
-          20+ minutes: {ew_bef[20][0]:.1f}%
-        </div>
-        <div style='font-size:0.9rem; color:{TEXT_MUTED}; margin-top:0.3rem;'>
-          average {ew_bef[20][1]:.0f} intervals per day
-        </div>
+    </div>
+    <div style='margin:1.2rem 0;'>
+      <div style='font-size:1.9rem; font-weight:800; color:{BLUE_BEFORE};
+                  font-family:"Barlow Condensed",sans-serif;'>
+        25+ minutes: {ew_bef[25][0]:.1f}%
       </div>
-      <div style='margin:1.2rem 0;'>
-        <div style='font-size:1.9rem; font-weight:800; color:{BLUE_BEFORE};
-                    font-family:"Barlow Condensed",sans-serif;'>
-          25+ minutes: {ew_bef[25][0]:.1f}%
-        </div>
-        <div style='font-size:0.9rem; color:{TEXT_MUTED}; margin-top:0.3rem;'>
-          average &lt;1 interval per day
-        </div>
+      <div style='font-size:0.9rem; color:{TEXT_MUTED}; margin-top:0.3rem;'>
+        average &lt;1 interval per day
       </div>
     </div>
-    """, unsafe_allow_html=True)
-with col_after:
-    st.markdown(f"""
-    <div style='background:rgba(232,51,74,0.12); border:2px solid {RED_AFTER};
-                border-radius:8px; padding:1.5rem;'>
-      <div style='text-align:center; font-size:1rem; font-weight:700; color:{RED_AFTER};
-                  margin-bottom:1.5rem; letter-spacing:0.05em;'>M TRAIN (after Dec 8)</div>
-      <div style='margin:1.2rem 0;'>
-        <div style='font-size:1.9rem; font-weight:800; color:{RED_AFTER};
-                    font-family:"Barlow Condensed",sans-serif;'>
-          15+ minutes: {ew_aft[15][0]:.1f}%
-        </div>
-        <div style='font-size:0.9rem; color:{TEXT_MUTED}; margin-top:0.3rem;'>
-          average {ew_aft[15][1]:.0f} intervals per day
-        </div>
+  </div>
+  <div class="ew-spacer"></div>
+  <div style='background:rgba(232,51,74,0.12); border:2px solid {RED_AFTER};
+              border-radius:8px; padding:1.5rem;'>
+    <div style='text-align:center; font-size:1rem; font-weight:700; color:{RED_AFTER};
+                margin-bottom:1.5rem; letter-spacing:0.05em;'>M TRAIN (after Dec 8)</div>
+    <div style='margin:1.2rem 0;'>
+      <div style='font-size:1.9rem; font-weight:800; color:{RED_AFTER};
+                  font-family:"Barlow Condensed",sans-serif;'>
+        15+ minutes: {ew_aft[15][0]:.1f}%
       </div>
-      <div style='margin:1.2rem 0;'>
-        <div style='font-size:1.9rem; font-weight:800; color:{RED_AFTER};
-                    font-family:"Barlow Condensed",sans-serif;'>
-          20+ minutes: {ew_aft[20][0]:.1f}%
-        </div>
-        <div style='font-size:0.9rem; color:{TEXT_MUTED}; margin-top:0.3rem;'>
-          average {ew_aft[20][1]:.0f} intervals per day
-        </div>
+      <div style='font-size:0.9rem; color:{TEXT_MUTED}; margin-top:0.3rem;'>
+        average {ew_aft[15][1]:.0f} intervals per day
+      </div>
+    </div>
+    <div style='margin:1.2rem 0;'>
+      <div style='font-size:1.9rem; font-weight:800; color:{RED_AFTER};
+                  font-family:"Barlow Condensed",sans-serif;'>
+        20+ minutes: {ew_aft[20][0]:.1f}%
       </div>
-      <div style='margin:1.2rem 0;'>
-        <div style='font-size:1.9rem; font-weight:800; color:{RED_AFTER};
-                    font-family:"Barlow Condensed",sans-serif;'>
-          25+ minutes: {ew_aft[25][0]:.1f}%
-        </div>
-        <div style='font-size:0.9rem; color:{TEXT_MUTED}; margin-top:0.3rem;'>
-          average {ew_aft[25][1]:.0f} interval per day
-        </div>
+      <div style='font-size:0.9rem; color:{TEXT_MUTED}; margin-top:0.3rem;'>
+        average {ew_aft[20][1]:.0f} intervals per day
       </div>
     </div>
-    """, unsafe_allow_html=True)
+    <div style='margin:1.2rem 0;'>
+      <div style='font-size:1.9rem; font-weight:800; color:{RED_AFTER};
+                  font-family:"Barlow Condensed",sans-serif;'>
+        25+ minutes: {ew_aft[25][0]:.1f}%
+      </div>
+      <div style='font-size:0.9rem; color:{TEXT_MUTED}; margin-top:0.3rem;'>
+        average {ew_aft[25][1]:.0f} interval per day
+      </div>
+    </div>
+  </div>
+</div>
+""", unsafe_allow_html=True)
 
 st.markdown(f"""
 <div style='font-size:0.82rem; color:{TEXT_MUTED}; font-style:italic; margin:0.75rem 0 2rem;
@@ -923,9 +988,9 @@ st.markdown(f"""
 
 col1, col2 = st.columns(2)
 with col1:
-    st.plotly_chart(long_wait_fig(df, "S", "Southbound (→ Manhattan)"), use_container_width=True, config={"displayModeBar": False})
+    st.plotly_chart(charts["long_wait_s"], use_container_width=True, config=PLOTLY_CONFIG)
 with col2:
-    st.plotly_chart(long_wait_fig(df, "N", "Northbound (→ Queens/Home)"), use_container_width=True, config={"displayModeBar": False})
+    st.plotly_chart(charts["long_wait_n"], use_container_width=True, config=PLOTLY_CONFIG)
 
 with st.expander("ℹ️ How to read this chart"):
     st.markdown(f"""
@@ -978,7 +1043,7 @@ st.markdown("<br>", unsafe_allow_html=True)
 col1, col2 = st.columns(2)
 with col1:
     st.markdown('<div class="section-head">Was It the Storm?</div>', unsafe_allow_html=True)
-    st.plotly_chart(sensitivity_fig(df), use_container_width=True, config={"displayModeBar": False})
+    st.plotly_chart(charts["sensitivity"], use_container_width=True, config=PLOTLY_CONFIG)
 with col2:
     st.markdown('<div class="section-head">FAQs</div>', unsafe_allow_html=True)
     st.markdown(f"""
@@ -1074,7 +1139,7 @@ with st.expander("📊 How We Know This Is Real — Full Data & Methodology", ex
       of the M swap on weekdays. The gap between weekday and weekend increases isolates the swap's impact.
     </div>
     """, unsafe_allow_html=True)
-    st.plotly_chart(weekend_fig(df), use_container_width=True, config={"displayModeBar": False})
+    st.plotly_chart(charts["weekend"], use_container_width=True, config=PLOTLY_CONFIG)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
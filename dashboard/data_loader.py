@@ -14,6 +14,7 @@ Currently supports: Roosevelt Island (B06N / B06S)
 from __future__ import annotations
 import os
 from datetime import date
+import numpy as np
 import pandas as pd
 
 # ── Station registry ──────────────────────────────────────────────────────────
@@ -30,7 +31,8 @@ STATIONS = {
     }
 }
 
-SWAP_DATE = date(2025, 12, 8)
+SWAP_DATE  = date(2025, 12, 8)
+STORM_DATE = date(2026, 1, 25)   # Winter storm — start of the sensitivity-analysis window
 
 TIME_BUCKETS = [
     ( 0,  6, "Early AM (12–6 AM)"),
@@ -39,7 +41,29 @@ TIME_BUCKETS = [
     (16, 19, "Evening Rush (4–7 PM)"),
     (19, 24, "Night (7 PM–midnight)"),
 ]
+_BUCKET_LABELS = [label for _, _, label in TIME_BUCKETS]
+# Bucket code for each hour 0–23, built once — indexing it by hour is a
+# single gather instead of a bin search per row
+_HOUR_TO_BUCKET = np.repeat(
+    np.arange(len(TIME_BUCKETS), dtype=np.int8),
+    [end - start for start, end, _ in TIME_BUCKETS],
+)
 SWAP_ACTIVE_BUCKETS = {"Morning Rush (6–9 AM)", "Midday (9 AM–4 PM)", "Evening Rush (4–7 PM)"}
+_ACTIVE_BUCKET_CODES = np.array(
+    [i for i, label in enumerate(_BUCKET_LABELS) if label in SWAP_ACTIVE_BUCKETS], dtype=np.int8,
+)
+
+# Only the columns _prepare needs, with explicit types so the parser skips
+# dtype inference and allocates narrow columns up front. headway_min stays
+# float64: medians like 11.35 round differently in float32 and would change
+# the displayed values
+_CSV_COLUMNS = ["arrival_date", "hour", "direction", "is_weekday", "headway_min"]
+_CSV_DTYPES  = {
+    "hour":        "int8",
+    "direction":   "category",
+    "is_weekday":  "bool",
+    "headway_min": "float64",
+}
 
 
 def load_headways(source: str = "csv", csv_path: str | None = None) -> pd.DataFrame:
@@ -52,12 +76,16 @@ def load_headways(source: str = "csv", csv_path: str | None = None) -> pd.DataFr
         Where to load data from. Switch to "supabase" when scaling up.
     csv_path : str, optional
         Path to CSV file when source="csv". Defaults to data/ directory.
+        A Parquet copy (<name>.dashboard.parquet) is cached next to the CSV
+        on first read and used instead of it while it matches the CSV's
+        exact mtime and size and the current column schema.
 
     Returns
     -------
     pd.DataFrame with columns:
         arrival_date, hour, direction, is_weekday, headway_min,
-        swap_period, day_type, time_bucket, within_swap_window
+        swap_period, day_type, time_bucket, within_swap_window,
+        is_preswap, is_post_storm
     """
     if source == "csv":
         return _load_from_csv(csv_path)
@@ -83,7 +111,49 @@ def _load_from_csv(path: str | None) -> pd.DataFrame:
                 "Cannot find roosevelt_island_headways.csv. "
                 "Place it in the same directory as app.py or in a data/ subfolder."
             )
-    return _prepare(pd.read_csv(path))
+
+    return _prepare(_read_csv_cached(path))
+
+
+def _read_csv_cached(path: str) -> pd.DataFrame:
+    # Own suffix so it never collides with 4_community_output.py's cache
+    # (roosevelt_island_headways.parquet) if pointed at scripts/results/.
+    # The .key file records what the cache was built from: the CSV's exact
+    # mtime and size (a file restored with an older timestamp still misses)
+    # and the column schema (a dtype change never reuses an old cache)
+    base = os.path.splitext(path)[0] + ".dashboard"
+    parquet_path, key_path = base + ".parquet", base + ".key"
+    st  = os.stat(path)
+    key = f"{st.st_mtime_ns} {st.st_size} {_CSV_COLUMNS} {_CSV_DTYPES}"
+    try:
+        with open(key_path) as f:
+            if f.read() == key:
+                return _load_from_parquet(parquet_path)
+    except FileNotFoundError:
+        pass
+
+    # pyarrow's multithreaded columnar parser is several times faster than
+    # pandas' default C engine on this file
+    df = pd.read_csv(
+        path, engine="pyarrow",
+        usecols=_CSV_COLUMNS, dtype=_CSV_DTYPES, parse_dates=["arrival_date"],
+    )
+    try:
+        # Key removed first and written last, so a half-written cache never matches
+        if os.path.exists(key_path):
+            os.remove(key_path)
+        df.to_parquet(parquet_path, engine="pyarrow", compression="zstd", index=False)
+        with open(key_path, "w") as f:
+            f.write(key)
+    except OSError:
+        pass  # Read-only deploy directory — keep serving from the CSV
+    return df
+
+
+def _load_from_parquet(path: str) -> pd.DataFrame:
+    # Parquet keeps the dtypes written by _load_from_csv, so no parsing or
+    # type conversion happens here
+    return pd.read_parquet(path, engine="pyarrow")
 
 
 def _load_from_supabase() -> pd.DataFrame:
@@ -109,55 +179,95 @@ def _load_from_supabase() -> pd.DataFrame:
 
 
 def _prepare(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df["arrival_date"] = pd.to_datetime(df["arrival_date"]).dt.date
-    df["is_weekday"]   = df["is_weekday"].astype(bool)
-
-    # Clip artifacts
-    early_am = df["hour"] < 6
-    df = df[((early_am) & (df["headway_min"] <= 90)) |
-            ((~early_am) & (df["headway_min"] <= 60))]
-    df = df[df["headway_min"] >= 1]
-
-    # Derived columns
-    df["swap_period"] = df["arrival_date"].apply(
-        lambda d: "After swap" if d >= SWAP_DATE else "Before swap"
+    # Expects the typed columns produced by _load_from_csv (datetime64
+    # arrival_date, bool is_weekday) — loaders are responsible for dtypes.
+    # No defensive copy: the row selection below is the only copy made.
+
+    # Clip artifacts — one fused mask, one row selection. take() rather than
+    # .loc[mask]: pandas 2.x marks a .loc slice as a view of the input and
+    # warns (SettingWithCopyWarning) on every column added below
+    h   = df["headway_min"].to_numpy()
+    cap = np.where(df["hour"].to_numpy() < 6, 90, 60)   # overnight cap is 90 min
+    df  = df.take(np.flatnonzero((h >= 1) & (h <= cap)))
+
+    # Boolean masks — computed once here so figure builders can combine them
+    # with `&` instead of re-deriving them from dates and labels on every call
+    df["is_preswap"]    = df["arrival_date"] < pd.Timestamp(SWAP_DATE)
+    df["is_post_storm"] = df["arrival_date"] >= pd.Timestamp(STORM_DATE)
+
+    # Derived columns — built from the masks' codes, no per-row Python calls
+    df["swap_period"] = pd.Categorical.from_codes(
+        (~df["is_preswap"].to_numpy()).astype(np.int8),
+        categories=["Before swap", "After swap"],
+    )
+    df["day_type"] = pd.Categorical.from_codes(
+        (~df["is_weekday"].to_numpy()).astype(np.int8),
+        categories=["Weekday", "Weekend"],
+    )
+    bucket_codes = _HOUR_TO_BUCKET[df["hour"].to_numpy()]
+    df["time_bucket"] = pd.Categorical.from_codes(
+        bucket_codes, categories=_BUCKET_LABELS, ordered=True,
     )
-    df["day_type"] = df["is_weekday"].map({True: "Weekday", False: "Weekend"})
-    df["time_bucket"] = df["hour"].apply(_assign_bucket)
+    # Membership test on the int8 codes, ANDed with the weekday flag on the
+    # raw bool arrays — no label comparisons
     df["within_swap_window"] = (
-        df["is_weekday"] & df["time_bucket"].isin(SWAP_ACTIVE_BUCKETS)
+        df["is_weekday"].to_numpy() & np.isin(bucket_codes, _ACTIVE_BUCKET_CODES)
     )
 
-    return df.reset_index(drop=True)
+    # swap_period, day_type and time_bucket are already categorical; make
+    # direction match so every `==` filter compares int8 codes, not strings
+    df["direction"] = df["direction"].astype("category")
 
+    # hour is 0–23, so int8 loses nothing; no-op for the CSV/Parquet path,
+    # which already reads it this way, but keeps other loaders (e.g. Supabase)
+    # equally compact. headway_min stays float64 — see _CSV_DTYPES
+    df["hour"] = df["hour"].astype(np.int8)
 
-def _assign_bucket(hour: int) -> str:
-    for start, end, label in TIME_BUCKETS:
-        if start <= hour < end:
-            return label
-    return "Unknown"
+    return df.reset_index(drop=True)
 
 
 # ── Convenience query helpers ─────────────────────────────────────────────────
+# build_summary() aggregates the frame once; the get_* helpers are then plain
+# index lookups instead of a full boolean-mask scan per query.
+
+PCT_OVER_THRESHOLDS = (10.0, 15.0, 20.0, 25.0)
+
+_SUMMARY_KEYS = ["day_type", "time_bucket", "direction", "swap_period"]
+_WINDOW_KEYS  = ["day_type", "direction", "swap_period"]
+
+
+def build_summary(df: pd.DataFrame,
+                  thresholds: tuple[float, ...] = PCT_OVER_THRESHOLDS) -> dict:
+    """
+    Pre-aggregate a prepared headway frame for get_median / get_pct_over.
+
+    Returns
+    -------
+    dict with:
+        "median"   — Series of median headway indexed by
+                     (day_type, time_bucket, direction, swap_period)
+        "pct_over" — DataFrame indexed by (day_type, direction, swap_period),
+                     one column per threshold: % of swap-window headways above it
+    """
+    medians = df.groupby(_SUMMARY_KEYS, observed=True)["headway_min"].median()
+
+    # One boolean column per threshold, then a single groupby-mean over all
+    # of them — the group factorization is done once, not once per threshold
+    window = df[df["within_swap_window"]]
+    h = window["headway_min"].to_numpy()
+    exceeds = pd.DataFrame({t: h > t for t in thresholds}, index=window.index)
+    pct_over = exceeds.groupby([window[k] for k in _WINDOW_KEYS], observed=True).mean() * 100
+    return {"median": medians, "pct_over": pct_over}
+
 
-def get_median(df: pd.DataFrame, *, day_type: str, bucket: str,
+def get_median(summary: dict, *, day_type: str, bucket: str,
                direction: str, period: str) -> float | None:
-    sub = df[
-        (df["day_type"]    == day_type) &
-        (df["time_bucket"] == bucket) &
-        (df["direction"]   == direction) &
-        (df["swap_period"] == period)
-    ]["headway_min"]
-    return float(sub.median()) if not sub.empty else None
+    value = summary["median"].get((day_type, bucket, direction, period))
+    return float(value) if value is not None else None
 
 
-def get_pct_over(df: pd.DataFrame, threshold: float, *, direction: str,
+def get_pct_over(summary: dict, threshold: float, *, direction: str,
                  period: str, day_type: str = "Weekday") -> float | None:
-    sub = df[
-        df["within_swap_window"] &
-        (df["day_type"]    == day_type) &
-        (df["direction"]   == direction) &
-        (df["swap_period"] == period)
-    ]["headway_min"]
-    return float(100 * (sub > threshold).mean()) if not sub.empty else None
+    """threshold must be one of the thresholds passed to build_summary()."""
+    value = summary["pct_over"][threshold].get((day_type, direction, period))
+    return float(value) if value is not None else None
@@ -0,0 +1,136 @@
+"""
+Tests for the data access layer.
+
+Ensures _prepare() cleans and labels headways correctly and that the
+pre-aggregated query helpers agree with a direct filter of the frame.
+Run with: pytest dashboard/tests/test_data_loader.py -v
+"""
+
+import pandas as pd
+import pytest
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _raw_frame():
+    """Small typed frame shaped like _load_from_csv() output."""
+    rows = [
+        # arrival_date, hour, direction, is_weekday, headway_min
+        ("2025-12-01",  7, "S", True,   6.0),
+        ("2025-12-01",  7, "S", True,   8.0),
+        ("2025-12-01",  7, "S", True,  12.0),
+        ("2025-12-01", 17, "N", True,   4.0),
+        ("2025-12-01", 17, "N", True,  11.0),
+        ("2025-12-09",  7, "S", True,  10.0),
+        ("2025-12-09",  7, "S", True,  16.0),
+        ("2025-12-09", 17, "N", True,   9.0),
+        ("2025-12-09", 17, "N", True,  21.0),
+        ("2025-12-13", 12, "N", False,  7.0),
+        ("2025-12-09",  3, "S", True,  80.0),   # overnight — kept (90 min cap)
+        ("2025-12-09",  8, "S", True,  75.0),   # daytime — clipped (60 min cap)
+        ("2025-12-09",  8, "S", True,   0.5),   # below 1 min — clipped
+    ]
+    df = pd.DataFrame(rows, columns=["arrival_date", "hour", "direction",
+                                     "is_weekday", "headway_min"])
+    df["arrival_date"] = pd.to_datetime(df["arrival_date"])
+    df["hour"] = df["hour"].astype("int8")
+    return df
+
+
+@pytest.fixture
+def prepared():
+    from data_loader import _prepare
+    return _prepare(_raw_frame())
+
+
+# ── _prepare tests ────────────────────────────────────────────────────────────
+
+class TestPrepare:
+    """Test cleaning and derived columns."""
+
+    def test_clips_artifacts(self, prepared):
+        """Sub-minute and over-cap headways are dropped; overnight cap is 90 min."""
+        assert prepared["headway_min"].min() >= 1
+        assert 80.0 in prepared["headway_min"].tolist()
+        assert 75.0 not in prepared["headway_min"].tolist()
+        assert len(prepared) == 11
+
+    def test_swap_period_and_buckets(self, prepared):
+        """Rows are labelled by swap date and time-of-day bucket."""
+        first = prepared.iloc[0]
+        assert first["swap_period"] == "Before swap"
+        assert first["time_bucket"] == "Morning Rush (6–9 AM)"
+        assert first["within_swap_window"]
+
+        weekend = prepared[~prepared["is_weekday"]].iloc[0]
+        assert weekend["day_type"] == "Weekend"
+        assert not weekend["within_swap_window"]
+
+    def test_downcasts_numeric_columns(self):
+        """hour comes out as int8 even from an untyped frame; headway_min keeps float64."""
+        from data_loader import _prepare
+        raw = _raw_frame().astype({"hour": "int64"})
+        out = _prepare(raw)
+        assert out["hour"].dtype == "int8"
+        assert out["headway_min"].dtype == "float64"
+
+    def test_no_warnings(self):
+        """Adding columns to the clipped rows raises no SettingWithCopyWarning (pandas 2.x)."""
+        import warnings
+        from data_loader import _prepare
+        raw = _raw_frame()   # keep the input alive, as pandas only warns while it exists
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            _prepare(raw)
+
+
+# ── Query helper tests ────────────────────────────────────────────────────────
+
+class TestQueryHelpers:
+    """Test build_summary() lookups against direct filters."""
+
+    def test_get_median_matches_filter(self, prepared):
+        """get_median() returns the median of the matching rows."""
+        from data_loader import build_summary, get_median
+        summary = build_summary(prepared)
+
+        value = get_median(summary, day_type="Weekday", bucket="Morning Rush (6–9 AM)",
+                           direction="S", period="Before swap")
+        assert value == pytest.approx(8.0)
+
+    def test_get_median_missing_group(self, prepared):
+        """get_median() returns None when no rows match."""
+        from data_loader import build_summary, get_median
+        summary = build_summary(prepared)
+
+        assert get_median(summary, day_type="Weekend", bucket="Night (7 PM–midnight)",
+                          direction="S", period="After swap") is None
+
+    def test_get_pct_over_matches_filter(self, prepared):
+        """get_pct_over() is the % of swap-window headways above the threshold."""
+        from data_loader import build_summary, get_pct_over
+        summary = build_summary(prepared, thresholds=(10.0,))
+
+        assert get_pct_over(summary, 10.0, direction="N", period="Before swap") == pytest.approx(50.0)
+        assert get_pct_over(summary, 10.0, direction="S", period="After swap") == pytest.approx(50.0)
+
+
+
+# ── CSV cache tests ───────────────────────────────────────────────────────────
+
+class TestCsvCache:
+    """Test that the Parquet cache never outlives the CSV it was built from."""
+
+    def test_replaced_csv_with_old_mtime_is_reread(self, tmp_path):
+        """A CSV swapped in with its previous timestamp (cp -p) still misses the cache."""
+        import os
+        from data_loader import load_headways
+        csv = tmp_path / "headways.csv"
+        raw = _raw_frame()
+        raw.to_csv(csv, index=False)
+        stamp = csv.stat().st_mtime_ns
+        assert len(load_headways(csv_path=str(csv))) == 11
+
+        raw.iloc[:5].to_csv(csv, index=False)
+        os.utime(csv, ns=(stamp, stamp))
+        assert len(load_headways(csv_path=str(csv))) == 5
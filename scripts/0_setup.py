@@ -18,7 +18,7 @@ All checks print [OK] or [WARN]/[FAIL]. A failing check exits with code 1.
 
 import sys
 import os
-import importlib
+from importlib.metadata import version, PackageNotFoundError
 import subprocess
 import urllib.request
 from pathlib import Path
@@ -31,6 +31,7 @@ REQUIRED_PACKAGES = [
     ("requests",    "2.31.0"),
     ("pandas",      "2.0.0"),
     ("numpy",       "1.24.0"),
+    ("pyarrow",     "14.0.0"),
     ("matplotlib",  "3.7.0"),
     ("tqdm",        "4.65.0"),
 ]
@@ -58,22 +59,21 @@ def check_packages():
     print("\n── Required Packages ───────────────────────────────────────────")
     all_ok = True
     for pkg, min_ver in REQUIRED_PACKAGES:
+        # Read the installed version from package metadata — importing
+        # pandas/matplotlib just to read __version__ takes seconds
         try:
-            mod = importlib.import_module(pkg)
-            ver = getattr(mod, "__version__", None)
-            if ver is None:
-                print(f"  [WARN] {pkg}: installed but version unknown")
-                continue
-            if _version_tuple(ver) < _version_tuple(min_ver):
-                print(f"  [WARN] {pkg} {ver} < required {min_ver}  "
-                      f"(run: pip install --upgrade {pkg})")
-                all_ok = False
-            else:
-                print(f"  [OK]   {pkg} {ver}")
-        except ImportError:
+            ver = version(pkg)
+        except PackageNotFoundError:
             print(f"  [FAIL] {pkg} not installed  "
                   f"(run: pip install {pkg}>={min_ver})")
             all_ok = False
+            continue
+        if _version_tuple(ver) < _version_tuple(min_ver):
+            print(f"  [WARN] {pkg} {ver} < required {min_ver}  "
+                  f"(run: pip install --upgrade {pkg})")
+            all_ok = False
+        else:
+            print(f"  [OK]   {pkg} {ver}")
     return all_ok
 
 
@@ -17,14 +17,21 @@ HOW TO RUN:
 
 Files will be downloaded into a folder called "raw_data" in the same
 directory where you run this script. Each file is about 2-10MB compressed.
-Total download will be roughly 300-600MB, so give it 10-30 minutes depending
+Total download will be roughly 300-600MB. Up to 8 files download at once
+(rate-limited to 4 requests per second), so expect a few minutes depending
 on your connection.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import calendar
+import json
 import os
+import threading
 import time
-from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from typing import Optional
 
 # ── Configuration ─────────────────────────────────────────────────────────────
 
@@ -41,50 +48,181 @@ MONTHS = [
 
 BASE_URL = "https://subwaydata.nyc/data"
 
+# Downloads are latency-bound, so several run at once. The rate limit keeps
+# the total request rate polite to subwaydata.nyc regardless of pool size.
+MAX_WORKERS         = 8
+REQUESTS_PER_SECOND = 4
+CHUNK_SIZE          = 1 << 16   # 64 KB streaming write size
+
+# Last-Modified per downloaded file, so re-runs can ask the server whether
+# anything changed instead of trusting whatever is on disk
+MANIFEST_NAME = "last_modified.json"
+MANIFEST_LOCK = threading.Lock()
+
+# ETag / Last-Modified of the version a .part file was started from, kept
+# beside it so a resume can send If-Range and never splice two versions
+PART_META_SUFFIX = ".part.json"
+
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 def get_all_dates(year, month):
     """Return all dates (as date objects) in a given year/month."""
-    start = date(year, month, 1)
-    dates = []
-    d = start
-    while d.month == month:
-        dates.append(d)
-        d += timedelta(days=1)
-    return dates
+    _, n_days = calendar.monthrange(year, month)
+    return [date(year, month, day) for day in range(1, n_days + 1)]
+
+
+class RateLimiter:
+    """Spaces out calls to wait() so at most `rate` pass per second, across threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        time.sleep(max(0.0, slot - now))
+
+
+def make_session() -> requests.Session:
+    """One keep-alive connection pool shared by all download threads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS)
+    session.mount("https://", adapter)
+    return session
+
+
+def load_manifest(output_dir: str) -> dict:
+    """Last-Modified header recorded for each file, from previous runs."""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
 
+def save_manifest(output_dir: str, manifest: dict):
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
 
-def download_file(d: date, output_dir: str) -> str:
+
+def read_part_meta(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def if_range_value(part_meta: dict) -> Optional[str]:
+    """Validator for If-Range: a strong ETag if there is one, else Last-Modified."""
+    etag = part_meta.get("ETag")
+    if etag and not etag.startswith("W/"):   # weak ETags are not allowed in If-Range
+        return etag
+    return part_meta.get("Last-Modified")
+
+
+def discard_part(part_path: str, meta_path: str):
+    for path in (part_path, meta_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def download_file(d: date, output_dir: str, session: requests.Session,
+                  limiter: RateLimiter, manifest: dict) -> str:
     """
     Download the CSV tar.xz for a single date.
+
+    Files with a recorded Last-Modified are re-checked with If-Modified-Since
+    (a 304 costs no body). A leftover .part file from an interrupted run is
+    resumed with a Range request instead of starting over, guarded by
+    If-Range so a file that changed on the server is sent in full instead.
+
     Returns:
-      "ok"      — newly downloaded
-      "skipped" — file already existed on disk
+      "ok"      — newly downloaded (or updated on the server)
+      "skipped" — file already on disk and unchanged
       "missing" — server returned 404 (date not yet available)
       "failed"  — network error or unexpected HTTP status
     """
     filename = f"subwaydatanyc_{d.strftime('%Y-%m-%d')}_csv.tar.xz"
     output_path = os.path.join(output_dir, filename)
+    part_path = output_path + ".part"
+    meta_path = output_path + PART_META_SUFFIX
 
+    headers = {}
+    part_meta = {}
     if os.path.exists(output_path):
-        print(f"  [SKIP] {filename} already exists.")
-        return "skipped"
+        last_modified = manifest.get(filename)
+        if last_modified is None:
+            print(f"  [SKIP] {filename} already exists.")
+            return "skipped"
+        headers["If-Modified-Since"] = last_modified
+    elif os.path.exists(part_path):
+        part_meta = read_part_meta(meta_path)
+        validator = if_range_value(part_meta)
+        # Without a validator nothing ties the .part to the server's current
+        # version, so it is not resumed: the plain GET below starts over
+        if validator:
+            headers["Range"]    = f"bytes={os.path.getsize(part_path)}-"
+            headers["If-Range"] = validator
 
     url = f"{BASE_URL}/{filename}"
+    limiter.wait()
     try:
-        response = requests.get(url, timeout=60)
-        if response.status_code == 200:
-            with open(output_path, "wb") as f:
-                f.write(response.content)
-            size_kb = len(response.content) / 1024
-            print(f"  [OK]   {filename}  ({size_kb:.0f} KB)")
-            return "ok"
-        elif response.status_code == 404:
-            print(f"  [MISS] {filename} not found (404) — skipping.")
-            return "missing"
-        else:
-            print(f"  [ERR]  {filename} HTTP {response.status_code}")
-            return "failed"
+        # Stream the body to a .part file in 64 KB chunks so memory stays flat;
+        # it is renamed into place only once complete, so an interrupted
+        # download is never mistaken for a finished one on the next run.
+        with session.get(url, headers=headers, stream=True, timeout=60) as response:
+            if response.status_code == 304:
+                print(f"  [SKIP] {filename} unchanged on server.")
+                return "skipped"
+            elif response.status_code == 416:
+                # Range starts at or past the end of the remote file. The .part
+                # is complete only if it is exactly the size the server reports
+                # (Content-Range: bytes */N); anything else is discarded
+                remote_size = response.headers.get("Content-Range", "").rpartition("/")[2]
+                if not (remote_size.isdigit() and int(remote_size) == os.path.getsize(part_path)):
+                    response.close()
+                    discard_part(part_path, meta_path)
+                    print(f"  [WARN] {filename} partial file does not match the server — restarting.")
+                    return download_file(d, output_dir, session, limiter, manifest)
+                os.replace(part_path, output_path)
+                if "Last-Modified" in part_meta:
+                    with MANIFEST_LOCK:
+                        manifest[filename] = part_meta["Last-Modified"]
+                discard_part(part_path, meta_path)
+                print(f"  [OK]   {filename}  (resumed, already complete)")
+                return "ok"
+            elif response.status_code in (200, 206):
+                # 200 after a ranged request means the server ignored Range or
+                # If-Range found the file changed: either way, start over
+                resumed = response.status_code == 206
+                if not resumed:
+                    with open(meta_path, "w") as f:
+                        json.dump({k: response.headers[k] for k in ("ETag", "Last-Modified")
+                                   if k in response.headers}, f)
+                size = os.path.getsize(part_path) if resumed else 0
+                with open(part_path, "ab" if resumed else "wb") as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        f.write(chunk)
+                        size += len(chunk)
+                os.replace(part_path, output_path)
+                discard_part(part_path, meta_path)
+                last_modified = response.headers.get("Last-Modified", part_meta.get("Last-Modified"))
+                if last_modified:
+                    with MANIFEST_LOCK:
+                        manifest[filename] = last_modified
+                note = ", resumed" if resumed else ""
+                print(f"  [OK]   {filename}  ({size / 1024:.0f} KB{note})")
+                return "ok"
+            elif response.status_code == 404:
+                print(f"  [MISS] {filename} not found (404) — skipping.")
+                return "missing"
+            else:
+                print(f"  [ERR]  {filename} HTTP {response.status_code}")
+                return "failed"
     except requests.RequestException as e:
         print(f"  [ERR]  {filename} failed: {e}")
         return "failed"
@@ -99,22 +237,27 @@ def main():
     downloaded, skipped, missing, failed = 0, 0, 0, 0
     total_dates = 0
 
-    for year, month in MONTHS:
-        dates = get_all_dates(year, month)
-        total_dates += len(dates)
-        print(f"── {year}-{month:02d}  ({len(dates)} days) ──────────────────")
-        for d in dates:
-            result = download_file(d, OUTPUT_DIR)
-            if result == "ok":
-                downloaded += 1
-            elif result == "skipped":
-                skipped += 1
-            elif result == "missing":
-                missing += 1
-            else:
-                failed += 1
-            # Brief pause to be polite to the server
-            time.sleep(0.5)
+    session  = make_session()
+    limiter  = RateLimiter(REQUESTS_PER_SECOND)
+    manifest = load_manifest(OUTPUT_DIR)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        for year, month in MONTHS:
+            dates = get_all_dates(year, month)
+            total_dates += len(dates)
+            print(f"── {year}-{month:02d}  ({len(dates)} days) ──────────────────")
+            futures = [pool.submit(download_file, d, OUTPUT_DIR, session, limiter, manifest)
+                       for d in dates]
+            for future in as_completed(futures):
+                result = future.result()
+                if result == "ok":
+                    downloaded += 1
+                elif result == "skipped":
+                    skipped += 1
+                elif result == "missing":
+                    missing += 1
+                else:
+                    failed += 1
+    save_manifest(OUTPUT_DIR, manifest)
 
     available = downloaded + skipped
     coverage  = 100 * available / total_dates if total_dates > 0 else 0
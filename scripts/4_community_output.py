@@ -3,12 +3,17 @@ SCRIPT 4: COMMUNITY OUTPUT (v2)
 """
 
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")   # files only — skip GUI backend detection
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from datetime import date
+from csv_cache import read_csv_cached
 
 # Paths are resolved relative to this script's location so the script works
 # regardless of which directory it is invoked from.
@@ -27,100 +32,141 @@ SWAP_ACTIVE_BUCKETS = {"2:", "3:", "4:"}
 COLOR_BEFORE = "#4C8BE0"
 COLOR_AFTER  = "#E05C4C"
 SOURCE_NOTE  = "Source: subwaydata.nyc  |  Roosevelt Island (B06)  |  Oct 2025–Feb 2026"
+MAX_WORKERS  = 4   # chart-rendering processes
 
+# The headway CSV carries ~20 columns from 3_analyze.py; only these are used.
+# Explicit dtypes let the parser allocate narrow columns without inference.
+# float64 headways: float32 changes 1-decimal chart labels
+CSV_COLUMNS = ["arrival_date", "hour", "direction", "is_weekday", "headway_min"]
+CSV_DTYPES  = {
+    "hour":        "int8",
+    "direction":   "category",
+    "is_weekday":  "bool",
+    "headway_min": "float64",
+}
 
-def assign_bucket(hour, is_weekday):
-    for start, end, wd_label, we_label in TIME_BUCKETS:
-        if start <= hour < end:
-            return wd_label if is_weekday else we_label
-    return "Unknown"
+
+# Upper edge of each bucket and its weekday/weekend labels, indexed 0..4
+_BUCKET_ENDS = np.array([end for _, end, _, _ in TIME_BUCKETS])
+_WD_LABELS   = np.array([wd for _, _, wd, _ in TIME_BUCKETS], dtype=object)
+_WE_LABELS   = np.array([we for _, _, _, we in TIME_BUCKETS], dtype=object)
+_ACTIVE_IDX  = [i for i, (_, _, wd, _) in enumerate(TIME_BUCKETS) if wd[:2] in SWAP_ACTIVE_BUCKETS]
 
 
 def load_and_prep(csv_path):
-    df = pd.read_csv(csv_path)
-    df["arrival_date"] = pd.to_datetime(df["arrival_date"]).dt.date
-    df["is_weekday"]   = df["is_weekday"].astype(bool)
-    df["swap_period"]  = df["arrival_date"].apply(
-        lambda d: "After swap" if d >= SWAP_DATE else "Before swap"
+    # A typed Parquet copy of the needed columns is cached next to the CSV (see
+    # csv_cache.py); labels and clipping are always re-derived below so
+    # changes to SWAP_DATE or TIME_BUCKETS take effect
+    df = read_csv_cached(
+        csv_path, csv_path.with_suffix(".parquet"),
+        usecols=CSV_COLUMNS, dtype=CSV_DTYPES, parse_dates=["arrival_date"],
+    )
+    df["swap_period"]  = np.where(
+        df["arrival_date"].to_numpy() >= np.datetime64(SWAP_DATE), "After swap", "Before swap"
     )
     df["day_type"]    = df["is_weekday"].map({True: "Weekday", False: "Weekend"})
-    df["time_bucket"] = df.apply(lambda r: assign_bucket(r["hour"], r["is_weekday"]), axis=1)
-    early_am = df["time_bucket"].str.startswith("1:")
-    df = df[(early_am & (df["headway_min"] <= 90)) | (~early_am & (df["headway_min"] <= 60))]
-    df = df[df["headway_min"] >= 1]
+    idx = np.searchsorted(_BUCKET_ENDS, df["hour"].to_numpy(), side="right")
+    df["time_bucket"] = np.where(df["is_weekday"].to_numpy(), _WD_LABELS[idx], _WE_LABELS[idx])
+    df["swap_active"] = np.isin(idx, _ACTIVE_IDX)   # bucket falls in swap hours (any day type)
+    # Label columns become categoricals so the many == filters downstream
+    # compare small integer codes instead of strings
+    for col in ["day_type", "swap_period", "time_bucket", "direction"]:
+        df[col] = df[col].astype("category")
+    # Clip artifacts in one fused mask on the raw arrays; the early-AM bucket
+    # (index 0 from above) gets a 90 min cap, everything else 60
+    hm  = df["headway_min"].to_numpy()
+    cap = np.where(idx == 0, 90.0, 60.0)
+    df  = df.loc[(hm >= 1) & (hm <= cap)]
     print(f"Loaded {len(df):,} headway observations.")
     return df
 
 
-def plot_all_periods(df, out_dir):
-    wd_nb = df[(df["day_type"] == "Weekday") & (df["direction"] == "S")]
-    bucket_labels, before_medians, after_medians, before_p90s, after_p90s, in_swap = [], [], [], [], [], []
+STAT_KEYS = ["day_type", "direction", "time_bucket", "swap_period"]
+
+
+def headway_stats(df):
+    """Median and 90th-percentile headway for every (day_type, direction, time_bucket, swap_period) cell."""
+    gb = df.groupby(STAT_KEYS, observed=True)["headway_min"]
+    return pd.DataFrame({"median": gb.median(), "p90": gb.quantile(0.90)})
+
+
+def _bucket_table(stats, day_type, direction, bucket_labels):
+    """One day type/direction of the stats table as rows = buckets (in the given order),
+    columns = (median|p90, swap_period). Buckets missing either period are dropped."""
+    cells = stats.xs((day_type, direction), level=["day_type", "direction"])
+    return cells.unstack("swap_period").reindex(bucket_labels).dropna()
+
 
-    for _, __, wd_label, _ in TIME_BUCKETS:
-        sub = wd_nb[wd_nb["time_bucket"] == wd_label]
-        b   = sub[sub["swap_period"] == "Before swap"]["headway_min"]
-        a   = sub[sub["swap_period"] == "After swap"]["headway_min"]
-        if b.empty or a.empty: continue
-        short = wd_label.split(":", 1)[1].strip()
-        bucket_labels.append(short)
-        before_medians.append(b.median())
-        after_medians.append(a.median())
-        before_p90s.append(b.quantile(0.90))
-        after_p90s.append(a.quantile(0.90))
-        in_swap.append(wd_label[:2] in SWAP_ACTIVE_BUCKETS)
+def _plot_overview(stats, out_dir, direction_code, title, filename, color_change=True):
+    """Weekday median/p90 by time bucket for one direction, read from the headway_stats table.
+
+    color_change=False draws the % change labels in neutral grey instead of red/green.
+    """
+    tbl = _bucket_table(stats, "Weekday", direction_code, [wd for _, _, wd, _ in TIME_BUCKETS])
+    bucket_labels  = [label.split(":", 1)[1].strip() for label in tbl.index]
+    in_swap        = [label[:2] in SWAP_ACTIVE_BUCKETS for label in tbl.index]
+    before_medians = tbl[("median", "Before swap")].to_numpy()
+    after_medians  = tbl[("median", "After swap")].to_numpy()
+    before_p90s    = tbl[("p90", "Before swap")].to_numpy()
+    after_p90s     = tbl[("p90", "After swap")].to_numpy()
 
     x, width = np.arange(len(bucket_labels)), 0.35
     fig, ax = plt.subplots(figsize=(13, 7))
     bars_b = ax.bar(x - width/2, before_medians, width, label="F Train — Before Swap", color=COLOR_BEFORE, edgecolor="white", linewidth=1.2)
     bars_a = ax.bar(x + width/2, after_medians,  width, label="M Train — After Swap",  color=COLOR_AFTER,  edgecolor="white", linewidth=1.2)
 
-    for i, (bp, ap) in enumerate(zip(before_p90s, after_p90s)):
-        ax.plot(i - width/2, bp, "^", color=COLOR_BEFORE, markersize=9, zorder=5)
-        ax.plot(i + width/2, ap, "^", color=COLOR_AFTER,  markersize=9, zorder=5)
+    ax.scatter(x - width/2, before_p90s, marker="^", color=COLOR_BEFORE, s=81, zorder=5)
+    ax.scatter(x + width/2, after_p90s,  marker="^", color=COLOR_AFTER,  s=81, zorder=5)
+    ax.bar_label(bars_b, labels=[f"{v:.1f}m" for v in before_medians], padding=3, fontsize=9, fontweight="bold", color=COLOR_BEFORE)
+    ax.bar_label(bars_a, labels=[f"{v:.1f}m" for v in after_medians],  padding=3, fontsize=9, fontweight="bold", color=COLOR_AFTER)
 
     for i, (bv, av) in enumerate(zip(before_medians, after_medians)):
-        ax.text(i - width/2, bv + 0.2, f"{bv:.1f}m", ha="center", va="bottom", fontsize=9, fontweight="bold", color=COLOR_BEFORE)
-        ax.text(i + width/2, av + 0.2, f"{av:.1f}m", ha="center", va="bottom", fontsize=9, fontweight="bold", color=COLOR_AFTER)
         pct = (av - bv) / bv * 100
+        color = ("#CC2200" if pct > 0 else "#006600") if color_change else "#333333"
         ax.text(i, max(av, bv) + 1.6, f"+{pct:.0f}%" if pct >= 0 else f"{pct:.0f}%",
-                ha="center", va="bottom", fontsize=10, fontweight="bold", color="#333333")
+                ha="center", va="bottom", fontsize=10, fontweight="bold", color=color)
 
     for i, swap in enumerate(in_swap):
         if swap: ax.axvspan(i - 0.5, i + 0.5, alpha=0.06, color=COLOR_AFTER, zorder=0)
 
     ax.set_xticks(x); ax.set_xticklabels(bucket_labels, fontsize=11)
     ax.set_ylabel("Median Minutes Between Trains", fontsize=12)
-    ax.set_title("Roosevelt Island Station — Weekday Wait Times: Before vs. After F/M Swap\nSouthbound (→ Manhattan) & Northbound (→ Queens)  |  All Time Periods", fontsize=13, fontweight="bold", pad=12)
+    ax.set_title(title, fontsize=13, fontweight="bold", pad=12)
     ax.yaxis.grid(True, linestyle="--", alpha=0.4); ax.set_axisbelow(True)
     ax.set_ylim(0, max(after_p90s) * 1.38)
     triangle = mpatches.Patch(color="gray", label="▲ = 90th percentile (1-in-10 worst waits)")
-    handles, labels = ax.get_legend_handles_labels()
-    ax.legend(handles + [triangle], labels + ["▲ = 90th percentile (1-in-10 worst waits)"], fontsize=10, loc="upper left")
+    handles, labels_leg = ax.get_legend_handles_labels()
+    ax.legend(handles + [triangle], labels_leg + ["▲ = 90th percentile (1-in-10 worst waits)"], fontsize=10, loc="upper left")
     ax.annotate("★ shaded = swap active (weekdays only)", xy=(1.0, 0.03), xycoords="axes fraction", fontsize=9, color="#999999", ha="right", style="italic")
     fig.text(0.5, 0.01, SOURCE_NOTE, ha="center", fontsize=9, color="gray")
     plt.tight_layout(rect=[0, 0.04, 1, 1])
-    path = out_dir / "all_periods_comparison.png"
-    plt.savefig(path, dpi=180, bbox_inches="tight"); plt.close()
-    print(f"Saved: {path}")
+    path = out_dir / filename
+    plt.savefig(path, dpi=180); plt.close()
+    return path
 
 
-def plot_evening_rush_spotlight(df, out_dir):
-    wd  = df[df["day_type"] == "Weekday"]
-    eve = wd[wd["time_bucket"].str.startswith("4:")]
+def plot_all_periods(stats, out_dir):
+    return _plot_overview(
+        stats, out_dir, "S",
+        "Roosevelt Island Station — Weekday Wait Times: Before vs. After F/M Swap\n"
+        "Southbound (→ Manhattan) & Northbound (→ Queens)  |  All Time Periods",
+        "all_periods_comparison.png", color_change=False,
+    )
+
+
+def plot_evening_rush_spotlight(stats, out_dir):
+    eve_label = TIME_BUCKETS[3][2]
     fig, ax = plt.subplots(figsize=(10, 7))
     categories, dir_codes = ["Northbound\n(→ Queens/Home)", "Southbound\n(→ Manhattan)"], ["N", "S"]
     x, width = np.arange(2), 0.32
-    before_m, after_m, before_p, after_p = [], [], [], []
-    for d in dir_codes:
-        b = eve[(eve["direction"] == d) & (eve["swap_period"] == "Before swap")]["headway_min"]
-        a = eve[(eve["direction"] == d) & (eve["swap_period"] == "After swap")]["headway_min"]
-        before_m.append(b.median()); after_m.append(a.median())
-        before_p.append(b.quantile(0.90)); after_p.append(a.quantile(0.90))
-    ax.bar(x - width/2, before_m, width, label="F Train (before Dec 8)", color=COLOR_BEFORE, edgecolor="white", linewidth=1.5)
-    ax.bar(x + width/2, after_m,  width, label="M Train (after Dec 8)",  color=COLOR_AFTER,  edgecolor="white", linewidth=1.5)
+    eve = stats.xs(("Weekday", eve_label), level=["day_type", "time_bucket"]).unstack("swap_period").reindex(dir_codes)
+    before_m, after_m = eve[("median", "Before swap")].to_numpy(), eve[("median", "After swap")].to_numpy()
+    before_p, after_p = eve[("p90", "Before swap")].to_numpy(),    eve[("p90", "After swap")].to_numpy()
+    bars_b = ax.bar(x - width/2, before_m, width, label="F Train (before Dec 8)", color=COLOR_BEFORE, edgecolor="white", linewidth=1.5)
+    bars_a = ax.bar(x + width/2, after_m,  width, label="M Train (after Dec 8)",  color=COLOR_AFTER,  edgecolor="white", linewidth=1.5)
+    ax.bar_label(bars_b, labels=[f"{v:.1f} min" for v in before_m], padding=3, fontsize=13, fontweight="bold", color=COLOR_BEFORE)
+    ax.bar_label(bars_a, labels=[f"{v:.1f} min" for v in after_m],  padding=3, fontsize=13, fontweight="bold", color=COLOR_AFTER)
     for i, (bv, av) in enumerate(zip(before_m, after_m)):
-        ax.text(i - width/2, bv + 0.2, f"{bv:.1f} min", ha="center", va="bottom", fontsize=13, fontweight="bold", color=COLOR_BEFORE)
-        ax.text(i + width/2, av + 0.2, f"{av:.1f} min", ha="center", va="bottom", fontsize=13, fontweight="bold", color=COLOR_AFTER)
         pct = (av - bv) / bv * 100
         ax.annotate(f"+{pct:.0f}% longer", xy=(i, max(av, bv) + 1.8), ha="center", fontsize=13, fontweight="bold", color="#CC2200",
                     bbox=dict(boxstyle="round,pad=0.3", facecolor="#FFF0ED", edgecolor="#E05C4C"))
@@ -132,83 +178,52 @@ def plot_evening_rush_spotlight(df, out_dir):
     fig.text(0.5, 0.01, SOURCE_NOTE + "  |  Weekdays only", ha="center", fontsize=9, color="gray")
     plt.tight_layout(rect=[0, 0.04, 1, 1])
     path = out_dir / "evening_rush_spotlight.png"
-    plt.savefig(path, dpi=180, bbox_inches="tight"); plt.close()
-    print(f"Saved: {path}")
+    plt.savefig(path, dpi=180); plt.close()
+    return path
 
 
-def plot_direction_overview(df, out_dir, direction_code, direction_label, filename):
+def plot_direction_overview(stats, out_dir, direction_code, direction_label, filename):
     """All-periods overview for a single direction. Used for both NB and SB."""
-    wd = df[(df["day_type"] == "Weekday") & (df["direction"] == direction_code)]
-    bucket_labels, before_medians, after_medians, before_p90s, after_p90s, in_swap = [], [], [], [], [], []
-
-    for _, __, wd_label, _ in TIME_BUCKETS:
-        sub = wd[wd["time_bucket"] == wd_label]
-        b   = sub[sub["swap_period"] == "Before swap"]["headway_min"]
-        a   = sub[sub["swap_period"] == "After swap"]["headway_min"]
-        if b.empty or a.empty: continue
-        short = wd_label.split(":", 1)[1].strip()
-        bucket_labels.append(short)
-        before_medians.append(b.median())
-        after_medians.append(a.median())
-        before_p90s.append(b.quantile(0.90))
-        after_p90s.append(a.quantile(0.90))
-        in_swap.append(wd_label[:2] in SWAP_ACTIVE_BUCKETS)
-
-    x, width = np.arange(len(bucket_labels)), 0.35
-    fig, ax = plt.subplots(figsize=(13, 7))
-    bars_b = ax.bar(x - width/2, before_medians, width, label="F Train — Before Swap", color=COLOR_BEFORE, edgecolor="white", linewidth=1.2)
-    bars_a = ax.bar(x + width/2, after_medians,  width, label="M Train — After Swap",  color=COLOR_AFTER,  edgecolor="white", linewidth=1.2)
+    return _plot_overview(
+        stats, out_dir, direction_code,
+        f"Roosevelt Island Station — {direction_label}\nWeekday Wait Times Before vs. After F/M Swap",
+        filename,
+    )
 
-    for i, (bp, ap) in enumerate(zip(before_p90s, after_p90s)):
-        ax.plot(i - width/2, bp, "^", color=COLOR_BEFORE, markersize=9, zorder=5)
-        ax.plot(i + width/2, ap, "^", color=COLOR_AFTER,  markersize=9, zorder=5)
 
-    for i, (bv, av) in enumerate(zip(before_medians, after_medians)):
-        ax.text(i - width/2, bv + 0.2, f"{bv:.1f}m", ha="center", va="bottom", fontsize=9, fontweight="bold", color=COLOR_BEFORE)
-        ax.text(i + width/2, av + 0.2, f"{av:.1f}m", ha="center", va="bottom", fontsize=9, fontweight="bold", color=COLOR_AFTER)
-        pct = (av - bv) / bv * 100
-        color = "#CC2200" if pct > 0 else "#006600"
-        ax.text(i, max(av, bv) + 1.6, f"+{pct:.0f}%" if pct >= 0 else f"{pct:.0f}%",
-                ha="center", va="bottom", fontsize=10, fontweight="bold", color=color)
+def _quantile(headways, q):
+    """Linearly interpolated quantile (same as Series.quantile) via quickselect, not a full sort."""
+    v = headways.to_numpy()
+    pos = q * (len(v) - 1)
+    lo, hi = int(pos), min(int(pos) + 1, len(v) - 1)
+    part = np.partition(v, [lo, hi])
+    t, diff = pos - lo, part[hi] - part[lo]
+    # Interpolate from the nearer end, as numpy/pandas do, so results match to the bit
+    return part[hi] - diff * (1 - t) if t >= 0.5 else part[lo] + diff * t
 
-    for i, swap in enumerate(in_swap):
-        if swap: ax.axvspan(i - 0.5, i + 0.5, alpha=0.06, color=COLOR_AFTER, zorder=0)
 
-    ax.set_xticks(x); ax.set_xticklabels(bucket_labels, fontsize=11)
-    ax.set_ylabel("Median Minutes Between Trains", fontsize=12)
-    ax.set_title(f"Roosevelt Island Station — {direction_label}\nWeekday Wait Times Before vs. After F/M Swap", fontsize=13, fontweight="bold", pad=12)
-    ax.yaxis.grid(True, linestyle="--", alpha=0.4); ax.set_axisbelow(True)
-    ax.set_ylim(0, max(after_p90s) * 1.38)
-    triangle = mpatches.Patch(color="gray", label="▲ = 90th percentile (1-in-10 worst waits)")
-    handles, labels_leg = ax.get_legend_handles_labels()
-    ax.legend(handles + [triangle], labels_leg + ["▲ = 90th percentile (1-in-10 worst waits)"], fontsize=10, loc="upper left")
-    ax.annotate("★ shaded = swap active (weekdays only)", xy=(1.0, 0.03), xycoords="axes fraction", fontsize=9, color="#999999", ha="right", style="italic")
-    fig.text(0.5, 0.01, SOURCE_NOTE, ha="center", fontsize=9, color="gray")
-    plt.tight_layout(rect=[0, 0.04, 1, 1])
-    path = out_dir / filename
-    plt.savefig(path, dpi=180, bbox_inches="tight"); plt.close()
-    print(f"Saved: {path}")
+def _pct_over(headways, thresholds):
+    """% of headways strictly above each threshold — one sort, then a binary search per threshold."""
+    v = np.sort(headways.to_numpy())
+    n_at_or_below = np.searchsorted(v, thresholds, side="right")
+    return (100 * ((len(v) - n_at_or_below) / len(v))).tolist()
 
 
 def plot_long_wait_frequency(df, out_dir, direction_code, direction_label, filename):
     """How often riders face waits above common thresholds. Used for both NB and SB."""
-    swap_buckets = df["time_bucket"].str[:2].isin(SWAP_ACTIVE_BUCKETS)
-    subset = df[(df["day_type"] == "Weekday") & (df["direction"] == direction_code) & swap_buckets]
+    subset = df[(df["day_type"] == "Weekday") & (df["direction"] == direction_code) & df["swap_active"]]
     before = subset[subset["swap_period"] == "Before swap"]["headway_min"]
     after  = subset[subset["swap_period"] == "After swap"]["headway_min"]
     thresholds = [5, 8, 10, 12, 15]
-    before_pcts = [100 * (before > t).mean() for t in thresholds]
-    after_pcts  = [100 * (after  > t).mean() for t in thresholds]
+    before_pcts = _pct_over(before, thresholds)
+    after_pcts  = _pct_over(after,  thresholds)
     x, width = np.arange(len(thresholds)), 0.35
     fig, ax = plt.subplots(figsize=(11, 7))
     bars_b = ax.bar(x - width/2, before_pcts, width, label="F Train — Before Swap", color=COLOR_BEFORE, edgecolor="white")
     bars_a = ax.bar(x + width/2, after_pcts,  width, label="M Train — After Swap",  color=COLOR_AFTER,  edgecolor="white")
-    for bar in bars_b:
-        h = bar.get_height()
-        if h > 0.5: ax.text(bar.get_x() + bar.get_width()/2, h + 0.4, f"{h:.0f}%", ha="center", va="bottom", fontsize=9, color=COLOR_BEFORE, fontweight="bold")
-    for bar in bars_a:
-        h = bar.get_height()
-        if h > 0.5: ax.text(bar.get_x() + bar.get_width()/2, h + 0.4, f"{h:.0f}%", ha="center", va="bottom", fontsize=9, color=COLOR_AFTER, fontweight="bold")
+    # Bars under 0.5% are left unlabelled
+    ax.bar_label(bars_b, labels=[f"{h:.0f}%" if h > 0.5 else "" for h in before_pcts], padding=3, fontsize=9, color=COLOR_BEFORE, fontweight="bold")
+    ax.bar_label(bars_a, labels=[f"{h:.0f}%" if h > 0.5 else "" for h in after_pcts],  padding=3, fontsize=9, color=COLOR_AFTER,  fontweight="bold")
     ax.set_xticks(x); ax.set_xticklabels([f"More than\n{t} minutes" for t in thresholds], fontsize=12)
     ax.set_ylabel("% of train intervals where riders waited this long", fontsize=12)
     ax.set_title(f"Roosevelt Island — How Often Do Riders Face a Long Wait?\n{direction_label}, Weekdays 6 AM–7 PM (Swap Active Hours)", fontsize=13, fontweight="bold", pad=12)
@@ -217,11 +232,11 @@ def plot_long_wait_frequency(df, out_dir, direction_code, direction_label, filen
     fig.text(0.5, 0.01, SOURCE_NOTE, ha="center", fontsize=9, color="gray")
     plt.tight_layout(rect=[0, 0.04, 1, 1])
     path = out_dir / filename
-    plt.savefig(path, dpi=180, bbox_inches="tight"); plt.close()
-    print(f"Saved: {path}")
+    plt.savefig(path, dpi=180); plt.close()
+    return path
 
 
-def plot_weekend_impact(df, out_dir):
+def plot_weekend_impact(stats, out_dir):
     """Weekend headways before vs after the swap date.
 
     The swap is weekday-only — the F train serves Roosevelt Island on weekends
@@ -229,7 +244,6 @@ def plot_weekend_impact(df, out_dir):
     F-line service degradation unrelated to the swap itself, and provides context
     for understanding whether the F has gotten worse system-wide.
     """
-    we = df[df["day_type"] == "Weekend"]
     directions = [
         ("S", "Southbound (→ Manhattan)"),
         ("N", "Northbound (→ Queens/Home)"),
@@ -243,24 +257,18 @@ def plot_weekend_impact(df, out_dir):
     )
 
     for ax, (dir_code, dir_label) in zip(axes, directions):
-        bucket_labels, before_medians, after_medians = [], [], []
-        for _, __, _, we_label in TIME_BUCKETS:
-            sub = we[(we["direction"] == dir_code) & (we["time_bucket"] == we_label)]
-            b = sub[sub["swap_period"] == "Before swap"]["headway_min"]
-            a = sub[sub["swap_period"] == "After swap"]["headway_min"]
-            if b.empty or a.empty: continue
-            short = we_label.split(":", 1)[1].strip()
-            bucket_labels.append(short)
-            before_medians.append(b.median())
-            after_medians.append(a.median())
+        tbl = _bucket_table(stats, "Weekend", dir_code, [we for _, _, _, we in TIME_BUCKETS])
+        bucket_labels  = [label.split(":", 1)[1].strip() for label in tbl.index]
+        before_medians = tbl[("median", "Before swap")].to_numpy()
+        after_medians  = tbl[("median", "After swap")].to_numpy()
 
         x, width = np.arange(len(bucket_labels)), 0.35
-        ax.bar(x - width/2, before_medians, width, label="F Train — Before Dec 8", color=COLOR_BEFORE, edgecolor="white", linewidth=1.2)
-        ax.bar(x + width/2, after_medians,  width, label="F Train — After Dec 8",  color=COLOR_AFTER,  edgecolor="white", linewidth=1.2)
+        bars_b = ax.bar(x - width/2, before_medians, width, label="F Train — Before Dec 8", color=COLOR_BEFORE, edgecolor="white", linewidth=1.2)
+        bars_a = ax.bar(x + width/2, after_medians,  width, label="F Train — After Dec 8",  color=COLOR_AFTER,  edgecolor="white", linewidth=1.2)
+        ax.bar_label(bars_b, labels=[f"{v:.1f}m" for v in before_medians], padding=3, fontsize=8, fontweight="bold", color=COLOR_BEFORE)
+        ax.bar_label(bars_a, labels=[f"{v:.1f}m" for v in after_medians],  padding=3, fontsize=8, fontweight="bold", color=COLOR_AFTER)
 
         for i, (bv, av) in enumerate(zip(before_medians, after_medians)):
-            ax.text(i - width/2, bv + 0.2, f"{bv:.1f}m", ha="center", va="bottom", fontsize=8, fontweight="bold", color=COLOR_BEFORE)
-            ax.text(i + width/2, av + 0.2, f"{av:.1f}m", ha="center", va="bottom", fontsize=8, fontweight="bold", color=COLOR_AFTER)
             pct = (av - bv) / bv * 100
             color = "#CC2200" if pct > 5 else ("#006600" if pct < -5 else "#666666")
             ax.text(i, max(av, bv) + 1.4, f"{pct:+.0f}%",
@@ -284,25 +292,22 @@ def plot_weekend_impact(df, out_dir):
     plt.tight_layout()
     path = out_dir / "weekend_impact.png"
     plt.savefig(path, dpi=180, bbox_inches="tight"); plt.close()
-    print(f"Saved: {path}")
+    return path
 
 
 def plot_worst_waits(df, out_dir):
-    swap_buckets = df["time_bucket"].str[:2].isin(SWAP_ACTIVE_BUCKETS)
-    wd_nb_swap = df[(df["day_type"] == "Weekday") & (df["direction"] == "S") & swap_buckets]
+    wd_nb_swap = df[(df["day_type"] == "Weekday") & (df["direction"] == "S") & df["swap_active"]]
     before = wd_nb_swap[wd_nb_swap["swap_period"] == "Before swap"]["headway_min"]
     after  = wd_nb_swap[wd_nb_swap["swap_period"] == "After swap"]["headway_min"]
     thresholds = [5, 8, 10, 12, 15]
-    before_pcts = [100 * (before > t).mean() for t in thresholds]
-    after_pcts  = [100 * (after  > t).mean() for t in thresholds]
+    before_pcts = _pct_over(before, thresholds)
+    after_pcts  = _pct_over(after,  thresholds)
     x, width = np.arange(len(thresholds)), 0.35
     fig, ax = plt.subplots(figsize=(11, 7))
     bars_b = ax.bar(x - width/2, before_pcts, width, label="F Train — Before Swap", color=COLOR_BEFORE, edgecolor="white")
     bars_a = ax.bar(x + width/2, after_pcts,  width, label="M Train — After Swap",  color=COLOR_AFTER,  edgecolor="white")
-    for bar in list(bars_b):
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5, f"{bar.get_height():.0f}%", ha="center", va="bottom", fontsize=11, fontweight="bold", color=COLOR_BEFORE)
-    for bar in list(bars_a):
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5, f"{bar.get_height():.0f}%", ha="center", va="bottom", fontsize=11, fontweight="bold", color=COLOR_AFTER)
+    ax.bar_label(bars_b, fmt="%.0f%%", padding=3, fontsize=11, fontweight="bold", color=COLOR_BEFORE)
+    ax.bar_label(bars_a, fmt="%.0f%%", padding=3, fontsize=11, fontweight="bold", color=COLOR_AFTER)
     ax.set_xticks(x); ax.set_xticklabels([f"More than\n{t} minutes" for t in thresholds], fontsize=12)
     ax.set_ylabel("% of train intervals where riders waited this long", fontsize=12)
     ax.set_title("Roosevelt Island — How Often Do Riders Face a Long Wait?\nSouthbound (→ Manhattan), Weekdays 6 AM–7 PM (Swap Active Hours)", fontsize=13, fontweight="bold", pad=12)
@@ -311,31 +316,35 @@ def plot_worst_waits(df, out_dir):
     fig.text(0.5, 0.01, SOURCE_NOTE, ha="center", fontsize=9, color="gray")
     plt.tight_layout(rect=[0, 0.04, 1, 1])
     path = out_dir / "worst_waits.png"
-    plt.savefig(path, dpi=180, bbox_inches="tight"); plt.close()
-    print(f"Saved: {path}")
-
-
-def write_talking_points(df, out_dir):
-    def get(day_type, bucket_prefix, direction, swap):
-        return df[(df["day_type"]==day_type) & df["time_bucket"].str.startswith(bucket_prefix) &
-                  (df["direction"]==direction) & (df["swap_period"]==swap)]["headway_min"]
-    def med(s): return f"{s.median():.1f}" if not s.empty else "N/A"
-    def p90(s): return f"{s.quantile(.9):.1f}" if not s.empty else "N/A"
+    plt.savefig(path, dpi=180); plt.close()
+    return path
+
+
+def write_talking_points(df, stats, out_dir):
+    # Per-bucket medians are lookups into the headway_stats table; only the
+    # both-directions swap-hours figures below need the raw headways
+    bucket_for_prefix = {wd[:2]: wd for _, _, wd, _ in TIME_BUCKETS}
+    def get(bucket_prefix, direction, swap):
+        return stats["median"].get(("Weekday", direction, bucket_for_prefix[bucket_prefix], swap), np.nan)
+    def med(m): return f"{m:.1f}" if not np.isnan(m) else "N/A"
+    def p90(s): return f"{_quantile(s, .9):.1f}" if not s.empty else "N/A"
     def pct_over(s, t): return f"{100*(s>t).mean():.0f}%" if not s.empty else "N/A"
     def chg(b, a):
-        if b.empty or a.empty: return "N/A"
-        d = a.median()-b.median(); p = d/b.median()*100
+        if np.isnan(b) or np.isnan(a): return "N/A"
+        d = a-b; p = d/b*100
         return f"+{p:.0f}% ({'LONGER' if d>0 else 'SHORTER'} by {abs(d):.1f} min)"
 
-    am_b = get("Weekday","2:","S","Before swap"); am_a = get("Weekday","2:","S","After swap")  # Southbound = to Manhattan
-    md_b = get("Weekday","3:","S","Before swap"); md_a = get("Weekday","3:","S","After swap")
-    ev_b_nb = get("Weekday","4:","N","Before swap"); ev_a_nb = get("Weekday","4:","N","After swap")  # Northbound = to Queens/home
-    ev_b_sb = get("Weekday","4:","S","Before swap"); ev_a_sb = get("Weekday","4:","S","After swap")  # Southbound = to Manhattan
-    swap_all = df[df["time_bucket"].str[:2].isin(SWAP_ACTIVE_BUCKETS) & (df["day_type"]=="Weekday")]  # Both directions
+    am_b = get("2:","S","Before swap"); am_a = get("2:","S","After swap")  # Southbound = to Manhattan
+    md_b = get("3:","S","Before swap"); md_a = get("3:","S","After swap")
+    ev_b_nb = get("4:","N","Before swap"); ev_a_nb = get("4:","N","After swap")  # Northbound = to Queens/home
+    ev_b_sb = get("4:","S","Before swap"); ev_a_sb = get("4:","S","After swap")  # Southbound = to Manhattan
+    swap_all = df[df["swap_active"] & (df["day_type"]=="Weekday")]  # Both directions
     all_b = swap_all[swap_all["swap_period"]=="Before swap"]["headway_min"]
     all_a = swap_all[swap_all["swap_period"]=="After swap"]["headway_min"]
-    ev_pct_nb = (ev_a_nb.median()-ev_b_nb.median())/ev_b_nb.median()*100
-    monthly_extra = (am_a.median()-am_b.median())*2*22 if not am_b.empty else 0
+    all_b_med = np.median(all_b.to_numpy()) if not all_b.empty else np.nan
+    all_a_med = np.median(all_a.to_numpy()) if not all_a.empty else np.nan
+    ev_pct_nb = (ev_a_nb-ev_b_nb)/ev_b_nb*100
+    monthly_extra = (am_a-am_b)*2*22 if not np.isnan(am_b) else 0
 
     content = f"""
 ROOSEVELT ISLAND SUBWAY — DATA-DRIVEN TALKING POINTS
@@ -361,7 +370,7 @@ MIDDAY (9 AM–4 PM):
   Northbound: {med(md_b)} min → {med(md_a)} min  ({chg(md_b, md_a)})
 
 ALL SWAP-ACTIVE HOURS (6 AM–7 PM, northbound):
-  Median: {med(all_b)} min → {med(all_a)} min  ({chg(all_b, all_a)})
+  Median: {med(all_b_med)} min → {med(all_a_med)} min  ({chg(all_b_med, all_a_med)})
   90th pct (1-in-10 worst waits): {p90(all_b)} → {p90(all_a)} min
   Waits > 10 min: {pct_over(all_b,10)} → {pct_over(all_a,10)}
   Waits > 15 min: {pct_over(all_b,15)} → {pct_over(all_a,15)}
@@ -378,8 +387,8 @@ HEADLINE OPTION B (broader):
    for a northbound train during the evening commute."
 
 COMMUTER IMPACT FRAMING:
-  "Before the swap, a northbound train came every {am_b.median():.0f} minutes during
-   morning rush. Today it's {am_a.median():.0f} minutes — an extra {am_a.median()-am_b.median():.0f} minutes
+  "Before the swap, a northbound train came every {am_b:.0f} minutes during
+   morning rush. Today it's {am_a:.0f} minutes — an extra {am_a-am_b:.0f} minutes
    every morning, or {monthly_extra:.0f} extra minutes per month for daily commuters."
 
 AVOID:
@@ -442,44 +451,53 @@ def main():
     if not csv_path.exists():
         raise FileNotFoundError(f"Cannot find {csv_path}. Run 3_analyze.py first.")
     df = load_and_prep(csv_path)
+    stats = headway_stats(df)   # one grouped pass feeds every median/p90 chart
+
+    # The charts are independent and CPU-bound in matplotlib's rasterizer, so
+    # each renders in its own worker process; every plot_* returns its path
+    charts = [
+        # ── Original charts ───────────────────────────────────────────────────
+        partial(plot_all_periods, stats, COMMUNITY_DIR),           # combined SB/NB overview (legacy)
+        partial(plot_evening_rush_spotlight, stats, COMMUNITY_DIR),
+        partial(plot_worst_waits, df, COMMUNITY_DIR),              # SB long-wait frequency (legacy name)
+
+        # ── New directional overviews ─────────────────────────────────────────
+        partial(
+            plot_direction_overview, stats, COMMUNITY_DIR,
+            direction_code="S",
+            direction_label="Southbound (→ Manhattan) — Morning Commute Direction",
+            filename="southbound_overview.png"
+        ),
+        partial(
+            plot_direction_overview, stats, COMMUNITY_DIR,
+            direction_code="N",
+            direction_label="Northbound (→ Queens/Home) — Evening Commute Direction",
+            filename="northbound_overview.png"
+        ),
+
+        # ── Long-wait frequency by direction ─────────────────────────────────
+        partial(
+            plot_long_wait_frequency, df, COMMUNITY_DIR,
+            direction_code="S",
+            direction_label="Southbound (→ Manhattan)",
+            filename="long_waits_southbound.png"
+        ),
+        partial(
+            plot_long_wait_frequency, df, COMMUNITY_DIR,
+            direction_code="N",
+            direction_label="Northbound (→ Queens/Home)",
+            filename="long_waits_northbound.png"
+        ),
+
+        # ── Weekend impact (F train both periods — systemwide signal) ─────────
+        partial(plot_weekend_impact, stats, COMMUNITY_DIR),
+    ]
+    with ProcessPoolExecutor(max_workers=min(MAX_WORKERS, os.cpu_count() or 1)) as pool:
+        futures = [pool.submit(chart) for chart in charts]
+        for future in futures:   # report in submission order, not completion order
+            print(f"Saved: {future.result()}")
 
-    # ── Original charts ───────────────────────────────────────────────────────
-    plot_all_periods(df, COMMUNITY_DIR)           # combined SB/NB overview (legacy)
-    plot_evening_rush_spotlight(df, COMMUNITY_DIR)
-    plot_worst_waits(df, COMMUNITY_DIR)           # SB long-wait frequency (legacy name)
-
-    # ── New directional overviews ─────────────────────────────────────────────
-    plot_direction_overview(
-        df, COMMUNITY_DIR,
-        direction_code="S",
-        direction_label="Southbound (→ Manhattan) — Morning Commute Direction",
-        filename="southbound_overview.png"
-    )
-    plot_direction_overview(
-        df, COMMUNITY_DIR,
-        direction_code="N",
-        direction_label="Northbound (→ Queens/Home) — Evening Commute Direction",
-        filename="northbound_overview.png"
-    )
-
-    # ── Long-wait frequency by direction ─────────────────────────────────────
-    plot_long_wait_frequency(
-        df, COMMUNITY_DIR,
-        direction_code="S",
-        direction_label="Southbound (→ Manhattan)",
-        filename="long_waits_southbound.png"
-    )
-    plot_long_wait_frequency(
-        df, COMMUNITY_DIR,
-        direction_code="N",
-        direction_label="Northbound (→ Queens/Home)",
-        filename="long_waits_northbound.png"
-    )
-
-    # ── Weekend impact (F train both periods — systemwide signal) ─────────────
-    plot_weekend_impact(df, COMMUNITY_DIR)
-
-    write_talking_points(df, COMMUNITY_DIR)
+    write_talking_points(df, stats, COMMUNITY_DIR)
     print(f"\nAll community outputs saved to: {COMMUNITY_DIR.resolve()}/")
 
 if __name__ == "__main__":
@@ -0,0 +1,37 @@
+"""
+csv_cache.py — Parquet cache for parsed CSVs
+=============================================
+Shared by 4_community_output.py and test_scripts.py, which both re-read
+results/roosevelt_island_headways.csv on every run.
+
+A cache is reused only for the exact CSV and read options it was built from:
+its .key file records the CSV's mtime (to the nanosecond), its size, and the
+read_csv arguments. A CSV restored with an older timestamp (cp -p, rsync -a,
+an archive) or a change to the requested columns/dtypes always re-reads.
+"""
+
+from pathlib import Path
+import pandas as pd
+
+
+def read_csv_cached(csv_path: Path, cache_path: Path, **read_csv_kwargs) -> pd.DataFrame:
+    """pd.read_csv(csv_path, engine="pyarrow", **read_csv_kwargs), via a Parquet
+    copy at cache_path. Raises FileNotFoundError if the CSV does not exist."""
+    st = csv_path.stat()
+    key = f"{st.st_mtime_ns} {st.st_size} {sorted(read_csv_kwargs.items())}"
+    key_path = cache_path.with_suffix(".key")
+    try:
+        if key_path.read_text() == key:
+            return pd.read_parquet(cache_path, engine="pyarrow")
+    except FileNotFoundError:
+        pass
+
+    df = pd.read_csv(csv_path, engine="pyarrow", **read_csv_kwargs)   # multithreaded C++ parser
+    try:
+        # Key removed first and written last, so a half-written cache never matches
+        key_path.unlink(missing_ok=True)
+        df.to_parquet(cache_path, engine="pyarrow", compression="zstd", index=False)
+        key_path.write_text(key)
+    except OSError:
+        pass  # Read-only results directory — parse the CSV again next run
+    return df
@@ -10,7 +10,11 @@ Run AFTER 3_analyze.py and 4_community_output.py:
 Exits 0 on full pass, 1 on any failure.
 """
 
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import date
 
@@ -22,48 +26,122 @@ COMMUNITY_DIR = RESULTS_DIR / "community"
 SWAP_DATE  = date(2025, 12, 8)
 STORM_DATE = date(2026, 1, 25)
 
+HEADWAYS_CSV = RESULTS_DIR / "roosevelt_island_headways.csv"
+# Separate from 4_community_output.py's cache, which holds different columns
+HEADWAYS_CACHE = RESULTS_DIR / "roosevelt_island_headways.tests.parquet"
+
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-_pass = 0
-_fail = 0
+# Suites run concurrently (see main), so ok/fail/section record into the
+# calling thread's own result instead of printing and bumping globals
+class _SuiteResult(threading.local):
+    def __init__(self):
+        # Fresh per thread, so the suites also work when called directly (e.g. by pytest)
+        self.passes, self.fails, self.lines = 0, 0, []
+
+
+_current = _SuiteResult()
 
 
 def ok(msg: str):
-    global _pass
-    _pass += 1
-    print(f"  [PASS] {msg}")
+    _current.passes += 1
+    _current.lines.append(f"  [PASS] {msg}")
 
 
 def fail(msg: str):
-    global _fail
-    _fail += 1
-    print(f"  [FAIL] {msg}")
+    _current.fails += 1
+    _current.lines.append(f"  [FAIL] {msg}")
 
 
 def section(title: str):
-    print(f"\n── {title} {'─' * max(1, 54 - len(title))}")
+    _current.lines.append(f"\n── {title} {'─' * max(1, 54 - len(title))}")
+
+
+def _run_suite(suite) -> tuple[int, int, list[str]]:
+    """Run one test_* function and return its (passes, fails, output lines)."""
+    _current.passes, _current.fails, _current.lines = 0, 0, []
+    suite()
+    return _current.passes, _current.fails, _current.lines
+
+
+def _dir_index(d: Path) -> dict:
+    """{name: size in bytes} for every file in d, from one directory read ({} if d is missing).
+
+    Sizes come from DirEntry.stat(), which reuses the directory entry rather
+    than resolving each path again.
+    """
+    try:
+        with os.scandir(d) as entries:
+            return {e.name: e.stat().st_size for e in entries if e.is_file()}
+    except FileNotFoundError:
+        return {}
+
+
+_headways_lock = threading.Lock()
+
+
+def _load_headways():
+    """Read the columns every CSV-backed suite needs in one parse, shared by all of them.
+
+    Suites must treat the result as read-only (select columns, don't assign into it).
+    The lock makes concurrent suites wait for the first parse instead of each starting one.
+    Returns None if the CSV does not exist — that result is cached too, so the
+    file is looked up once per run rather than once per suite.
+    """
+    with _headways_lock:
+        return _read_headways()
+
+
+@lru_cache(maxsize=1)
+def _read_headways():
+    from csv_cache import read_csv_cached   # imports pandas, so only when a suite needs it
+    try:
+        # Parsed columns are cached as Parquet (categories and dtypes kept)
+        # and reused only for this exact CSV — see csv_cache.py
+        return read_csv_cached(
+            HEADWAYS_CSV, HEADWAYS_CACHE,
+            usecols=["stop_id", "route_id", "is_weekday", "arrival_date",
+                     "swap_period", "headway_min", "time_bucket"],
+            dtype={"stop_id": "category", "route_id": "category", "swap_period": "category",
+                   "time_bucket": "category", "is_weekday": "bool", "headway_min": "float64"},
+            parse_dates=["arrival_date"],
+        )
+    except FileNotFoundError:
+        return None
 
 
 # ── Test suites ───────────────────────────────────────────────────────────────
 
 def test_raw_data_exists():
     section("Raw data files")
-    tar_files = sorted(RAW_DATA_DIR.glob("*.tar.xz"))
-    if tar_files:
-        ok(f"{len(tar_files)} .tar.xz files found in {RAW_DATA_DIR.name}/")
+    # One directory read; each archive is counted and classified by name as we go
+    n_tar = n_pre = n_post = 0
+    try:
+        with os.scandir(RAW_DATA_DIR) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.endswith(".tar.xz"):
+                    continue
+                n_tar += 1
+                if "_2025-1" in name or "_2025-11" in name:
+                    n_pre += 1
+                elif "_2026-" in name:
+                    n_post += 1
+    except FileNotFoundError:
+        pass
+    if n_tar:
+        ok(f"{n_tar} .tar.xz files found in {RAW_DATA_DIR.name}/")
     else:
         fail(f"No .tar.xz files in {RAW_DATA_DIR}. Run 1_download.py first.")
         return
 
     # Check at least one file per study period
-    pre_files  = [f for f in tar_files if "_2025-1" in f.name or "_2025-11" in f.name]
-    post_files = [f for f in tar_files if "_2026-" in f.name]
-    if pre_files:
-        ok(f"Pre-swap files present ({len(pre_files)} files in Oct/Nov 2025)")
+    if n_pre:
+        ok(f"Pre-swap files present ({n_pre} files in Oct/Nov 2025)")
     else:
         fail("No pre-swap (Oct/Nov 2025) files found.")
-    if post_files:
-        ok(f"Post-swap files present ({len(post_files)} files in 2026)")
+    if n_post:
+        ok(f"Post-swap files present ({n_post} files in 2026)")
     else:
         fail("No post-swap (2026) files found.")
 
@@ -75,9 +153,11 @@ def test_analysis_outputs():
         RESULTS_DIR / "headway_summary.csv",
         RESULTS_DIR / "results_report.txt",
     ]
+    index = _dir_index(RESULTS_DIR)
     for f in expected_files:
-        if f.exists() and f.stat().st_size > 0:
-            ok(f"{f.name} exists ({f.stat().st_size // 1024} KB)")
+        size = index.get(f.name)
+        if size:
+            ok(f"{f.name} exists ({size // 1024} KB)")
         else:
             fail(f"{f.name} missing or empty. Run 3_analyze.py.")
 
@@ -88,7 +168,7 @@ def test_analysis_outputs():
         RESULTS_DIR / "hourly_headways.png",
     ]
     for f in chart_files:
-        if f.exists() and f.stat().st_size > 0:
+        if index.get(f.name):
             ok(f"{f.name} exists")
         else:
             fail(f"{f.name} missing. Run 3_analyze.py.")
@@ -107,8 +187,9 @@ def test_community_outputs():
         COMMUNITY_DIR / "worst_waits.png",
         COMMUNITY_DIR / "talking_points.txt",
     ]
+    index = _dir_index(COMMUNITY_DIR)
     for f in expected:
-        if f.exists() and f.stat().st_size > 0:
+        if index.get(f.name):
             ok(f"{f.name} exists")
         else:
             fail(f"{f.name} missing. Run 4_community_output.py.")
@@ -116,25 +197,22 @@ def test_community_outputs():
 
 def test_direction_convention():
     section("Direction convention (headway CSV)")
-    csv_path = RESULTS_DIR / "roosevelt_island_headways.csv"
-    if not csv_path.exists():
-        fail("roosevelt_island_headways.csv not found — skipping direction check.")
-        return
-
     try:
-        import pandas as pd
-        df = pd.read_csv(csv_path, usecols=["stop_id", "route_id", "is_weekday",
-                                             "arrival_date", "swap_period"],
-                         low_memory=False)
-        df["arrival_date"] = pd.to_datetime(df["arrival_date"]).dt.date
+        headways = _load_headways()
     except Exception as e:
         fail(f"Could not read headways CSV: {e}")
         return
+    if headways is None:
+        fail("roosevelt_island_headways.csv not found — skipping direction check.")
+        return
+
+    df = headways[["stop_id", "route_id", "is_weekday", "swap_period"]]
 
     # Stop IDs
-    stop_ids = set(df["stop_id"].astype(str).str[-3:].unique())
+    # stop_id is categorical: test the handful of distinct IDs, not every row
+    stop_ids = df["stop_id"].cat.categories.astype(str)
     for expected in ["06N", "06S"]:
-        if any(expected in s for s in stop_ids):
+        if stop_ids.str.endswith(expected).any():
             ok(f"B{expected} stop ID present in data")
         else:
             fail(f"B{expected} stop ID NOT found — check GTFS station IDs.")
@@ -144,8 +222,10 @@ def test_direction_convention():
     pre  = weekdays[weekdays["swap_period"] == "Before swap"]
     post = weekdays[weekdays["swap_period"] == "After swap"]
 
-    pre_routes  = set(pre["route_id"].dropna().unique())
-    post_routes = set(post["route_id"].dropna().unique())
+    # Routes actually seen in each slice, read off the categorical rather
+    # than collected row by row (categories never include missing values)
+    pre_routes  = set(pre["route_id"].cat.remove_unused_categories().cat.categories)
+    post_routes = set(post["route_id"].cat.remove_unused_categories().cat.categories)
 
     if "F" in pre_routes:
         ok(f"F train in pre-swap weekdays (routes: {sorted(pre_routes)})")
@@ -160,25 +240,28 @@ def test_direction_convention():
 
 def test_headway_bounds():
     section("Headway value bounds")
-    csv_path = RESULTS_DIR / "roosevelt_island_headways.csv"
-    if not csv_path.exists():
-        fail("roosevelt_island_headways.csv not found — skipping bounds check.")
-        return
-
     try:
-        import pandas as pd
-        df = pd.read_csv(csv_path, usecols=["headway_min", "time_bucket"],
-                         low_memory=False)
+        import numpy as np
+        headways = _load_headways()
     except Exception as e:
         fail(f"Could not read headways CSV: {e}")
         return
+    if headways is None:
+        fail("roosevelt_island_headways.csv not found — skipping bounds check.")
+        return
+
+    df = headways[["headway_min", "time_bucket"]]
 
-    below_min = (df["headway_min"] < 1).sum()
-    early_am  = df["time_bucket"].astype(str).str.startswith("1:")
-    above_max = (
-        (early_am  & (df["headway_min"] > 90)) |
-        (~early_am & (df["headway_min"] > 60))
-    ).sum()
+    # Both counts come from plain arrays: a per-row cap (90 min early AM,
+    # 60 otherwise) replaces the two-branch mask
+    hw        = df["headway_min"].to_numpy()
+    # time_bucket is categorical: test each bucket label once, then expand to
+    # rows through the codes (the trailing False is what a missing code, -1, picks)
+    buckets   = df["time_bucket"].cat
+    early_cat = np.append(buckets.categories.astype(str).str.startswith("1:"), False)
+    early_am  = early_cat[buckets.codes.to_numpy()]
+    below_min = np.count_nonzero(hw < 1)
+    above_max = np.count_nonzero(hw > np.where(early_am, 90.0, 60.0))
 
     if below_min == 0:
         ok("No headways < 1 min (outlier filter applied)")
@@ -196,22 +279,23 @@ def test_headway_bounds():
 
 def test_date_coverage():
     section("Date coverage in headway data")
-    csv_path = RESULTS_DIR / "roosevelt_island_headways.csv"
-    if not csv_path.exists():
-        fail("roosevelt_island_headways.csv not found — skipping date coverage.")
-        return
-
     try:
-        import pandas as pd
-        df = pd.read_csv(csv_path, usecols=["arrival_date"], low_memory=False)
-        df["arrival_date"] = pd.to_datetime(df["arrival_date"]).dt.date
+        headways = _load_headways()
     except Exception as e:
         fail(f"Could not parse dates: {e}")
         return
+    if headways is None:
+        fail("roosevelt_island_headways.csv not found — skipping date coverage.")
+        return
 
-    min_date = df["arrival_date"].min()
-    max_date = df["arrival_date"].max()
-    n_dates  = df["arrival_date"].nunique()
+    # One pass over the rows for the distinct days; min, max and count are
+    # then taken over those few values
+    days = headways["arrival_date"].unique()   # already datetime64 from the reader
+    days = days[~days.isna()]
+
+    min_date = days.min().date()
+    max_date = days.max().date()
+    n_dates  = len(days)
     ok(f"Date range: {min_date} → {max_date}  ({n_dates} distinct days)")
 
     if min_date <= date(2025, 10, 31):
@@ -225,26 +309,48 @@ def test_date_coverage():
         fail(f"Post-swap data ends {max_date} — expected data into 2026.")
 
 
+def _headways_missing():
+    section("Headway CSV checks")
+    fail(f"{HEADWAYS_CSV.name} not found — skipping direction, bounds and date checks. "
+         "Run 3_analyze.py.")
+
+
 # ── Entry point ───────────────────────────────────────────────────────────────
 
 def main():
     print("Roosevelt Island MTA Analysis — Script Output Tests")
     print("=" * 55)
 
-    test_raw_data_exists()
-    test_analysis_outputs()
-    test_community_outputs()
-    test_direction_convention()
-    test_headway_bounds()
-    test_date_coverage()
+    suites = [
+        test_raw_data_exists,
+        test_analysis_outputs,
+        test_community_outputs,
+    ]
+    # Without the headway CSV the three suites that read it would each just
+    # report it missing; say so once instead
+    if HEADWAYS_CSV.exists():
+        suites += [test_direction_convention, test_headway_bounds, test_date_coverage]
+    else:
+        suites.append(_headways_missing)
+    # Filesystem checks overlap with the CSV parse; output is printed in
+    # suite order regardless of which finishes first
+    n_pass = n_fail = 0
+    with ThreadPoolExecutor(max_workers=len(suites)) as pool:
+        futures = [pool.submit(_run_suite, suite) for suite in suites]
+        for future in futures:
+            passes, fails, lines = future.result()
+            n_pass += passes
+            n_fail += fails
+            for line in lines:
+                print(line)
 
     print(f"\n{'=' * 55}")
-    print(f"Results: {_pass} passed, {_fail} failed.")
-    if _fail == 0:
+    print(f"Results: {n_pass} passed, {n_fail} failed.")
+    if n_fail == 0:
         print("All checks passed.")
         sys.exit(0)
     else:
-        print(f"{_fail} check(s) failed. See [FAIL] lines above.")
+        print(f"{n_fail} check(s) failed. See [FAIL] lines above.")
         sys.exit(1)
 
 